@@ -5,18 +5,20 @@
 1. Запустите этот скрипт: python manual_auth.py
 2. Откроется Yandex Browser с чистым профилем для автоматизации
 3. ВРУЧНУЮ авторизуйтесь на странице WB (введите номер и код из SMS)
-4. После успешной авторизации ЗАКРОЙТЕ браузер
+4. После успешной авторизации ЗАКРОЙТЕ браузер (скрипт завершится автоматически)
 5. Сессия сохранится в профиле yandex_automation_profile/
 6. При следующих запусках основного скрипта авторизация НЕ потребуется!
 """
 
 import time
 from pathlib import Path
-import undetected_chromedriver as uc
 from loguru import logger
 
 def manual_authorization():
     """Запуск браузера для ручной авторизации."""
+    # Импорт здесь: undetected_chromedriver тянет Selenium, нужен только при запуске
+    import undetected_chromedriver as uc
+    from selenium.common.exceptions import WebDriverException
     
     logger.info("=" * 60)
     logger.info("РЕЖИМ РУЧНОЙ АВТОРИЗАЦИИ")
@@ -40,7 +42,7 @@ def manual_authorization():
     automation_user_data = Path("./yandex_automation_profile").resolve()
     automation_user_data.mkdir(parents=True, exist_ok=True)
     
-    options.add_argument(f'--user-data-dir={str(automation_user_data.absolute())}')
+    options.add_argument(f'--user-data-dir={automation_user_data}')
     options.add_argument('--profile-directory=Default')
     
     # Папка для скачивания
@@ -52,7 +54,14 @@ def manual_authorization():
     options.add_argument("--start-maximized")
     options.add_argument("--disable-notifications")
     
-    logger.info(f"Профиль: {automation_user_data.absolute()}")
+    # Не поднимаем лишнего при старте: расширения, приложения по умолчанию,
+    # синхронизацию и фоновые сетевые запросы браузера
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--disable-sync")
+    options.add_argument("--disable-background-networking")
+    
+    logger.info(f"Профиль: {automation_user_data}")
     logger.info(f"Папка скачивания: {downloads_dir}")
     logger.info("")
     logger.info("Запуск браузера...")
@@ -83,13 +92,22 @@ def manual_authorization():
         logger.info("")
         logger.info("=" * 60)
         logger.success("АВТОРИЗУЙТЕСЬ ВРУЧНУЮ В БРАУЗЕРЕ")
-        logger.info("После авторизации нажмите Enter в терминале...")
+        logger.info("После авторизации закройте браузер - скрипт завершится сам")
         logger.info("=" * 60)
         
-        input("Нажмите Enter после авторизации: ")
+        # Ждём закрытия окна браузера (раз в секунду), чтобы профиль
+        # не оставался заблокированным висящим процессом
+        while True:
+            try:
+                if not driver.window_handles:
+                    break
+                _ = driver.current_url
+            except WebDriverException:
+                break
+            time.sleep(1)
         
         logger.info("")
-        logger.success("✓ Закрытие браузера...")
+        logger.success("✓ Браузер закрыт")
         logger.success("✓ Сессия сохранена в профиле")
         logger.info("")
         logger.info("=" * 60)
@@ -98,7 +116,11 @@ def manual_authorization():
         logger.success("Авторизация НЕ потребуется!")
         logger.info("=" * 60)
         
-        driver.quit()
+        # Завершаем chromedriver (окно уже закрыто пользователем)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
         
     except Exception as e:
         logger.error(f"Ошибка: {e}")
@@ -6,10 +6,12 @@
 3. Создание .env файла из .env_sample
 4. Проверка наличия Yandex Browser
 """
+import os
 import sys
 import subprocess
 import shutil
 from pathlib import Path
+from typing import Optional
 
 
 def check_python_version() -> bool:
@@ -42,16 +44,29 @@ def install_dependencies() -> bool:
         print("❌ ОШИБКА: Файл requirements.txt не найден!")
         return False
     
+    # Команды по убыванию скорости: uv (быстрый резолвер), pip только с готовыми
+    # колёсами (без сборки из исходников), обычный pip как последний вариант
+    pip_install = [sys.executable, "-m", "pip", "install"]
+    commands = [
+        pip_install + ["--prefer-binary", "--only-binary=:all:", "-r", str(requirements_file)],
+        pip_install + ["-r", str(requirements_file)],
+    ]
+    uv_path = shutil.which("uv")
+    if uv_path:
+        commands.insert(0, [uv_path, "pip", "install", "-r", str(requirements_file), "--python", sys.executable])
+    
     print("Установка пакетов из requirements.txt...")
-    try:
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
-        ])
-        print("✓ Зависимости установлены успешно")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ ОШИБКА при установке зависимостей: {e}")
-        return False
+    for i, command in enumerate(commands, 1):
+        try:
+            subprocess.check_call(command)
+            print("✓ Зависимости установлены успешно")
+            return True
+        except subprocess.CalledProcessError as e:
+            if i == len(commands):
+                print(f"❌ ОШИБКА при установке зависимостей: {e}")
+                return False
+            print(f"⚠️  Не удалось ({e}), пробую другой способ установки...")
+    return False
 
 
 def create_env_file() -> bool:
@@ -85,24 +100,30 @@ def create_env_file() -> bool:
         return False
 
 
+# Результат поиска Yandex Browser (чтобы не проверять диск повторно)
+_yandex_browser_path: Optional[Path] = None
+
+
 def check_yandex_browser() -> bool:
     """Проверяет наличие Yandex Browser."""
+    global _yandex_browser_path
+    
     print("\n" + "=" * 70)
     print("Шаг 4: Проверка Yandex Browser")
     print("=" * 70)
     
-    import os
-    from pathlib import Path
-    
-    # Стандартный путь к Yandex Browser
-    default_paths = [
-        Path(os.path.expandvars("%LOCALAPPDATA%")) / "Yandex" / "YandexBrowser" / "Application" / "browser.exe",
-        Path(os.path.expandvars("%PROGRAMFILES%")) / "Yandex" / "YandexBrowser" / "Application" / "browser.exe",
-        Path(os.path.expandvars("%PROGRAMFILES(X86)%")) / "Yandex" / "YandexBrowser" / "Application" / "browser.exe",
-    ]
+    if _yandex_browser_path is not None:
+        print(f"✓ Yandex Browser найден: {_yandex_browser_path}")
+        return True
     
-    for browser_path in default_paths:
+    # Стандартные каталоги установки Yandex Browser
+    for env_var in ("LOCALAPPDATA", "PROGRAMFILES", "PROGRAMFILES(X86)"):
+        root = os.environ.get(env_var)
+        if not root:
+            continue
+        browser_path = Path(root, "Yandex", "YandexBrowser", "Application", "browser.exe")
         if browser_path.exists():
+            _yandex_browser_path = browser_path
             print(f"✓ Yandex Browser найден: {browser_path}")
             return True
     
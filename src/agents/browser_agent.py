@@ -1,22 +1,142 @@
 """Агент для автоматизации работы с браузером Wildberries."""
+import functools
+import json
 import os
+import queue
+import random
 import re
 import time
 import shutil
 import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait as futures_wait
 from datetime import datetime, timedelta, date
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple
+from urllib.parse import urlsplit
 
-import undetected_chromedriver as uc
+import psutil
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.remote_connection import RemoteConnection
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from openpyxl import load_workbook
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
 from loguru import logger
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
 
 from src.config.settings import Settings
+from src.utils.xlsx_headers import CORRECT_HEADERS, needs_fix, replace_header_row
+
+# undetected_chromedriver импортируется при запуске браузера: модуль тяжёлый,
+# а агент импортируют и скрипты, которые браузер не открывают
+if TYPE_CHECKING:
+    import undetected_chromedriver as uc
+
+
+# Расширения скачиваемых отчётов
+REPORT_SUFFIXES = (".xlsx", ".xls")
+
+
+# Всё, кроме цифр (очистка номера телефона из настроек)
+_NON_DIGIT_RE = re.compile(r"\D")
+
+
+# Хосты и путь страниц WB, по которым определяется, где находится браузер
+SELLER_HOST = "seller.wildberries.ru"
+SELLER_AUTH_HOST = "seller-auth.wildberries.ru"
+REPORTS_PATH = "/analytics-reports/sales"
+
+
+def _is_reports_url(url: str) -> bool:
+    """Открыта ли страница отчётов: сравниваются хост и начало пути, а не подстрока всего URL."""
+    parts = urlsplit(url)
+    return parts.hostname == SELLER_HOST and parts.path.startswith(REPORTS_PATH)
+
+
+def _is_auth_url(url: str) -> bool:
+    """Открыта ли страница входа WB."""
+    return urlsplit(url).hostname == SELLER_AUTH_HOST
+
+
+# Размер пула HTTP-соединений к chromedriver (в Selenium по умолчанию 1)
+DRIVER_POOL_MAXSIZE = 20
+
+
+def _enlarge_driver_connection_pool() -> None:
+    """Увеличивает пул соединений urllib3, через который Selenium ходит в chromedriver.
+
+    С пулом из одного соединения частые ожидания и параллельные браузеры
+    переоткрывают TCP-соединения и дают предупреждения "Connection pool is full".
+    Патч применяется один раз на процесс и работает во всех версиях Selenium 4.
+    """
+    original = RemoteConnection._get_connection_manager
+    if getattr(original, "_pool_enlarged", False):
+        return
+
+    def _get_connection_manager(self):
+        manager = original(self)
+        manager.connection_pool_kw.update(maxsize=DRIVER_POOL_MAXSIZE, block=False)
+        return manager
+
+    _get_connection_manager._pool_enlarged = True
+    RemoteConnection._get_connection_manager = _get_connection_manager
+
+
+@functools.lru_cache(maxsize=4)
+def _read_template_row(path: str, mtime_ns: int) -> Tuple[str, ...]:
+    """Читает первую строку xlsx-файла в потоковом режиме read_only.
+
+    Args:
+        path: Путь к файлу
+        mtime_ns: Время изменения файла (часть ключа кэша - правка файла сбрасывает кэш)
+
+    Returns:
+        Значения первой строки без пустых ячеек в конце
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        first_row = next(wb.active.iter_rows(max_row=1, values_only=True), ())
+    finally:
+        wb.close()
+
+    headers = [str(value) if value is not None else "" for value in first_row]
+    # Пустые ячейки в конце строки не считаем заголовками
+    while headers and not headers[-1]:
+        headers.pop()
+    return tuple(headers)
+
+
+class _DownloadEventHandler(FileSystemEventHandler):
+    """Передаёт в очередь пути отчётов, появившихся в папке скачивания.
+
+    Вместе с путём передаётся признак завершённого скачивания.
+    """
+
+    def __init__(self, found: "queue.Queue[Tuple[Path, bool]]"):
+        super().__init__()
+        self.found = found
+
+    def _put_if_report(self, path: str, completed: bool) -> None:
+        file_path = Path(path)
+        if file_path.suffix.lower() in REPORT_SUFFIXES:
+            self.found.put((file_path, completed))
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._put_if_report(event.src_path, False)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        # .crdownload → .xlsx: браузер закончил скачивание (переименование атомарно)
+        if not event.is_directory:
+            self._put_if_report(event.dest_path, event.src_path.lower().endswith(".crdownload"))
 
 
 class BrowserAgent:
@@ -35,22 +155,186 @@ class BrowserAgent:
         {"name": "beautylab", "id": "4428365"},
     ]
 
-    def __init__(self, settings: Settings):
+    # Кнопка "Выгрузить в Excel" (CSS быстрее XPath с поиском по тексту)
+    DOWNLOAD_BUTTON_CSS = "button.Button-link__1abzU3JUeb.Button-link--button-big__Bi4mHiOkNS"
+    # Варианты кнопки выгрузки: по классу и, если классы сменились после обновления WB, по тексту
+    DOWNLOAD_BUTTON_LOCATORS = (
+        (By.CSS_SELECTOR, DOWNLOAD_BUTTON_CSS),
+        (By.XPATH, "//button[.//span[text()='Выгрузить в Excel']]"),
+    )
+
+    # Найденный кабинет в меню выбора: label кабинета, label чекбокса, сам чекбокс
+    CABINET_CHOICE_LOCATORS = (
+        (By.CSS_SELECTOR, "label.suppliers-item-new_SuppliersItem__label__j6lv6"),
+        (By.CSS_SELECTOR, 'label[data-testid="supplier-checkbox-checkbox"]'),
+        (By.CSS_SELECTOR, 'input[data-testid="supplier-checkbox-checkbox-input"]'),
+    )
+    CABINET_CHOICE_NAMES = ("label", "checkbox label", "input")
+
+    # Кнопка выбора кабинета (имя пользователя/кабинета со стрелкой вниз)
+    PROFILE_BUTTON_CSS = 'button[data-testid="desktop-profile-select-button-chips-component"]'
+    # Поле поиска кабинетов в раскрытом меню
+    SUPPLIERS_SEARCH_ID = "suppliers-search"
+    # Кнопка календаря выбора периода отчёта
+    CALENDAR_BUTTON_CSS = "button.Date-input__icon-button__WnbzIWQzsq"
+    # Заголовок страницы отчётов
+    SALES_TITLE_XPATH = "//span[text()='Продажи']"
+    # Кнопка "Сохранить" в календаре периода
+    SAVE_PERIOD_XPATH = "//button[@type='submit' and .//span[text()='Сохранить']]"
+
+    # Характерные элементы страницы отчётов: поле поиска кабинетов и кнопка календаря
+    REPORTS_PAGE_CSS = f"#{SUPPLIERS_SEARCH_ID}, {CALENDAR_BUTTON_CSS}"
+
+    # Частота опроса в ожиданиях элементов (по умолчанию в Selenium 0.5 с)
+    POLL_FREQUENCY = 0.15
+
+    # Сохранённые cookies сессии WB считаются актуальными не дольше недели
+    COOKIES_MAX_AGE_DAYS = 7
+    # Поля cookie, которые принимает CDP Network.setCookies (остальные из getAllCookies отбрасываются)
+    COOKIE_PARAM_KEYS = frozenset(
+        ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority")
+    )
+
+    # Кнопка отправки номера телефона: по data-testid, кнопка с картинкой-стрелкой или сама стрелка
+    SUBMIT_PHONE_XPATH = (
+        '//button[@data-testid="submit-phone-button"]'
+        ' | //img[contains(@class, "FormPhoneInputBorderless__image")]/ancestor::button'
+        ' | //img[@alt="" and contains(@class, "FormPhoneInputBorderless__image")]'
+    )
+
+    # Элементы формы входа: поле телефона, поле кода из SMS/почты, кнопка отправки
+    AUTH_SELECTORS = (
+        'input[data-testid="phone-input"]',
+        'div.FormTextInput__input-f6fPmoYx4c input[type="numeric"], input[type="numeric"]',
+        'button[type="submit"]',
+    )
+    # Первый видимый элемент для каждого селектора (кнопка - ещё и не disabled);
+    # Selenium возвращает найденные элементы как WebElement
+    AUTH_ELEMENTS_JS = """
+        const visible = el => el.offsetParent !== null || el.getClientRects().length > 0;
+        return Array.from(arguments).map((selector, i) =>
+            Array.from(document.querySelectorAll(selector)).find(
+                el => visible(el) && !(i === 2 && el.disabled)
+            ) || null
+        );
+    """
+
+    # Установка значения поля с событиями input/change. Значение пишется через
+    # нативный сеттер, иначе React не увидит изменения и перезапишет поле
+    SET_INPUT_VALUE_JS = """
+        const el = arguments[0];
+        const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set;
+        el.focus();
+        setter.call(el, arguments[1]);
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+    """
+
+    # Состояние сессии: "reports" - открыта страница отчётов (поле поиска кабинетов,
+    # кнопка календаря или заголовок "Продажи"/"Отчеты"), "auth" - форма входа, null - ни то ни другое.
+    # arguments[0] - REPORTS_PAGE_CSS (передаётся в _session_state)
+    SESSION_STATE_JS = """
+        if (document.querySelector(arguments[0])) return 'reports';
+        const title = document.evaluate(
+            "//span[text()='Продажи' or text()='Отчеты']", document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        if (title) return 'reports';
+        if (document.querySelector('input[data-testid="phone-input"]')) return 'auth';
+        if (/login|auth/i.test(location.href)) return 'auth';
+        return null;
+    """
+
+    # Мгновенная прокрутка к элементу (по центру экрана, без анимации)
+    SCROLL_INTO_VIEW_JS = "arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});"
+
+    # Селекторы индикаторов загрузки: сначала дешёвые точные классы,
+    # поиск по подстроке класса (обход всего DOM) - последним
+    LOADER_SELECTORS = (".loader", ".spinner", "[class*='loading']")
+    # Есть ли видимый индикатор загрузки: один запрос к chromedriver за опрос,
+    # проверка останавливается на первом селекторе с видимым элементом
+    VISIBLE_LOADER_JS = """
+        for (const selector of arguments[0]) {
+            for (const el of document.querySelectorAll(selector)) {
+                if (el.offsetParent !== null || el.getClientRects().length) return true;
+            }
+        }
+        return false;
+    """
+    # Страница готова: документ загружен и индикаторы загрузки скрыты (один запрос за опрос)
+    PAGE_READY_JS = (
+        "return document.readyState === 'complete' && !(function () {"
+        + VISIBLE_LOADER_JS
+        + "})(arguments[0]);"
+    )
+
+    # Сколько ждать driver.quit(), прежде чем завершить процессы браузера принудительно
+    DRIVER_QUIT_TIMEOUT = 10.0
+
+    # Основная версия Chromium, под которую скачивается ChromeDriver (Yandex 140)
+    CHROMEDRIVER_VERSION_MAIN = 140
+    # ChromeDriver, поставляемый вместе с проектом: bin/<версия>/chromedriver.exe или bin/chromedriver.exe
+    VENDORED_DRIVER_DIR = Path(__file__).resolve().parent.parent.parent / "bin"
+    DRIVER_FILE_NAME = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+
+    def __init__(
+        self,
+        settings: Settings,
+        profile_dir: Optional[Path] = None,
+        downloads_dir: Optional[Path] = None,
+    ):
         """Инициализация агента.
 
         Args:
             settings: Настройки приложения
+            profile_dir: Папка профиля браузера (по умолчанию ./yandex_automation_profile)
+            downloads_dir: Папка, куда браузер скачивает файлы (по умолчанию из настроек)
         """
         self.settings = settings
-        self.driver: Optional[uc.Chrome] = None
-        self.downloads_dir = Path(settings.downloads_dir).resolve()
+        self.driver: "Optional[uc.Chrome]" = None
+        _enlarge_driver_connection_pool()
+        self.profile_dir = (profile_dir or Path("./yandex_automation_profile")).resolve()
+        # Готовые файлы всегда складываются в общую папку downloads из настроек
+        self.output_dir = Path(settings.downloads_dir).resolve()
+        self.downloads_dir = Path(downloads_dir).resolve() if downloads_dir else self.output_dir
         self.data_dir = Path(settings.data_dir).resolve()
         self.example_first_stroke_path = Path(settings.example_first_stroke_file).resolve()
+        self.drivers_dir = Path(settings.drivers_dir).resolve()
+        # Строковые пути для аргументов браузера (пути уже абсолютные после resolve)
+        self._profile_dir_str = str(self.profile_dir)
+        self._downloads_dir_str = str(self.downloads_dir)
+        # Путь к браузеру с раскрытыми переменными окружения (наличие файла проверяется при первом запуске)
+        if settings.yandex_browser_path:
+            browser_path = Path(os.path.expandvars(settings.yandex_browser_path)).expanduser()
+        else:
+            browser_path = Path(os.path.expandvars("%LOCALAPPDATA%")) / "Yandex" / "YandexBrowser" / "Application" / "browser.exe"
+        self._browser_path_str = str(browser_path.absolute())
+        self._browser_checked = False
+        self._profile_ready = False
+        # Режим без окна (может быть выключен, если WB не пустил headless-браузер)
+        self._headless = settings.headless
+        # Путь к закэшированному ChromeDriver (заполняется при первом запуске)
+        self._driver_path: Optional[Path] = None
+        # Пути скачанных файлов и признак завершения (из событий CDP и файловой системы)
+        self._downloads: "queue.Queue[Tuple[Path, bool]]" = queue.Queue()
+        # Браузер сообщил через CDP, что скачивание завершено
+        self._download_done = threading.Event()
+        # Имена скачиваемых файлов по guid загрузки из CDP
+        self._download_names: Dict[str, str] = {}
+        # Отчёты (имя, размер, mtime_ns), лежавшие в папке до нажатия "Выгрузить"
+        self._files_before: frozenset = frozenset()
+        # Фоновая обработка последнего скачанного отчёта (см. _process_cabinets)
+        self._postprocess_future: Optional[Future] = None
+        # Наблюдатель за папкой скачивания (один на агента, запускается перед первым скачиванием)
+        self._observer: Optional[Observer] = None
 
         # Создаём необходимые папки
         self.downloads_dir.mkdir(parents=True, exist_ok=True)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
+        # Заголовки из файла-примера читаем один раз, а не для каждого кабинета
+        self._template_row = self._load_template_row()
+
     def start_browser(self) -> None:
         """Запуск Yandex Browser."""
         try:
@@ -62,30 +346,98 @@ class BrowserAgent:
 
     def _start_yandex_browser(self) -> None:
         """Запуск Yandex Browser с профилем из настроек (.env)."""
+        # Запуск браузера (undetected-chromedriver сам скрывает WebDriver)
+        logger.info("Запуск браузера...")
+        
+        try:
+            # Если ChromeDriver уже скачан и пропатчен - не скачиваем его заново
+            driver_path = self._get_cached_driver_path()
+
+            try:
+                self.driver = self._create_driver(driver_path)
+            except WebDriverException as e:
+                if driver_path is None:
+                    raise
+                # Браузер обновился и сохранённый драйвер не подходит - скачиваем заново
+                logger.warning(f"⚠ ChromeDriver {driver_path.name} не подошёл ({e.msg}), скачиваем заново...")
+                if not driver_path.is_relative_to(self.VENDORED_DRIVER_DIR):
+                    driver_path.unlink(missing_ok=True)
+                self._driver_path = driver_path = None
+                # undetected_chromedriver запускает браузер до создания сессии драйвера -
+                # оставшийся браузер держит профиль, и второй запуск на нём не откроется
+                self._kill_processes(self._profile_processes())
+                self.driver = self._create_driver(None)
+            
+            logger.success("✓ Браузер запущен")
+
+            # События скачивания: браузер сам сообщает о завершении загрузки файла
+            for event in ("Page.downloadWillBegin", "Browser.downloadWillBegin"):
+                self.driver.add_cdp_listener(event, self._on_download_will_begin)
+            for event in ("Page.downloadProgress", "Browser.downloadProgress"):
+                self.driver.add_cdp_listener(event, self._on_download_progress)
+
+            if driver_path is None:
+                self._cache_driver()
+            
+            # КРИТИЧНО: Настройка папки скачивания через CDP (обернуто в try-except).
+            # Browser.setDownloadBehavior с eventsEnabled включает события Browser.download*;
+            # устаревший Page.setDownloadBehavior - запасной вариант для старых браузеров
+            try:
+                try:
+                    self.driver.execute_cdp_cmd("Browser.setDownloadBehavior", {
+                        "behavior": "allow",
+                        "downloadPath": self._downloads_dir_str,
+                        "eventsEnabled": True,
+                    })
+                except WebDriverException:
+                    self.driver.execute_cdp_cmd("Page.setDownloadBehavior", {
+                        "behavior": "allow",
+                        "downloadPath": self._downloads_dir_str
+                    })
+                logger.info(f"✓ Папка скачивания: {self._downloads_dir_str}")
+            except Exception as cdp_error:
+                logger.warning(f"⚠ Не удалось установить папку скачивания через CDP: {cdp_error}")
+                logger.info("Браузер будет использовать папку скачивания по умолчанию")
+            
+            # КРИТИЧНО: Браузер должен полностью инициализироваться перед любыми действиями -
+            # ждём готовности стартовой вкладки вместо фиксированной паузы 5 с
+            self._wait_for_page_ready()
+            
+        except Exception as e:
+            logger.error(f"Ошибка запуска: {e}")
+            raise
+
+    def _build_options(self) -> "uc.ChromeOptions":
+        """Собирает опции запуска Yandex Browser с профилем из настроек (.env).
+
+        Returns:
+            Новый объект опций (undetected_chromedriver не позволяет использовать его повторно)
+        """
+        import undetected_chromedriver as uc
+
         options = uc.ChromeOptions()
 
-        # Определяем путь к Yandex Browser
-        if self.settings.yandex_browser_path:
-            browser_path = Path(os.path.expandvars(self.settings.yandex_browser_path)).expanduser()
-        else:
-            browser_path = Path(os.path.expandvars("%LOCALAPPDATA%")) / "Yandex" / "YandexBrowser" / "Application" / "browser.exe"
-        
-        if not browser_path.exists():
-            logger.error(f"✗ Yandex Browser не найден: {browser_path}")
-            raise Exception(f"Yandex Browser не найден: {browser_path}")
+        # Путь к браузеру и папка профиля проверяются один раз на агента:
+        # при перезапусках браузера (ensure_browser) повторные stat не нужны
+        if not self._browser_checked:
+            if not os.path.exists(self._browser_path_str):
+                logger.error(f"✗ Yandex Browser не найден: {self._browser_path_str}")
+                raise Exception(f"Yandex Browser не найден: {self._browser_path_str}")
+            self._browser_checked = True
 
-        options.binary_location = str(browser_path.absolute())
-        logger.info(f"✓ Yandex Browser: {browser_path}")
+        if not self._profile_ready:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            self._profile_ready = True
+
+        options.binary_location = self._browser_path_str
+        logger.info(f"✓ Yandex Browser: {self._browser_path_str}")
 
         # Используем изолированный профиль для сохранения авторизации
-        automation_profile = Path("./yandex_automation_profile").resolve()
-        automation_profile.mkdir(parents=True, exist_ok=True)
-        
-        options.add_argument(f'--user-data-dir={str(automation_profile.absolute())}')
+        options.add_argument(f'--user-data-dir={self._profile_dir_str}')
         options.add_argument('--profile-directory=Default')
         
         logger.info("✓ Используется профиль для сохранения авторизации")
-        logger.info(f"  Профиль: {automation_profile.absolute()}")
+        logger.info(f"  Профиль: {self._profile_dir_str}")
         logger.info("  ⚠ При первом запуске: авторизуйтесь вручную через manual_auth.py")
         logger.info("  ✓ При последующих запусках: автоматический вход")
 
@@ -93,41 +445,130 @@ class BrowserAgent:
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument("--start-maximized")
         options.add_argument("--disable-notifications")
+
+        # Без окна - только когда профиль уже авторизован (настройка HEADLESS)
+        if self._headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1920,1080")
+        
+        # Без картинок страницы отчётов грузятся быстрее (таблицы и формы от них не зависят).
+        # Через аргумент, а не prefs: prefs в undetected_chromedriver ломают профиль
+        if self.settings.disable_images:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+        
+        # Не поднимаем лишнего: расширения, приложения по умолчанию, синхронизацию,
+        # фоновые сетевые запросы и звук (тот же набор, что в manual_auth.py)
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-default-apps")
+        options.add_argument("--disable-sync")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--mute-audio")
+
+        # driver.get возвращается после DOMContentLoaded, полную загрузку ждёт _wait_for_page_ready
+        options.page_load_strategy = "eager"
         
         # Настройки скачивания (НЕ через prefs - это вызывает JSONDecodeError)
-        options.add_argument(f"--download-directory={str(self.downloads_dir.absolute())}")
+        options.add_argument(f"--download-directory={self._downloads_dir_str}")
 
-        # Запуск браузера (undetected-chromedriver сам скрывает WebDriver)
-        logger.info("Запуск браузера...")
-        
+        return options
+
+    def _create_driver(self, driver_path: Optional[Path]) -> "uc.Chrome":
+        """Запускает браузер через undetected_chromedriver.
+
+        Args:
+            driver_path: Путь к готовому ChromeDriver (None - скачать нужную версию)
+
+        Returns:
+            Драйвер запущенного браузера
+        """
+        import undetected_chromedriver as uc
+
+        # Опции собираются первыми: они же проверяют наличие браузера
+        options = self._build_options()
+        return uc.Chrome(
+            options=options,
+            browser_executable_path=self._browser_path_str,
+            driver_executable_path=str(driver_path) if driver_path else None,
+            version_main=self._driver_version_main,
+            use_subprocess=False,
+            enable_cdp_events=True,
+        )
+
+    @property
+    def _driver_version_main(self) -> int:
+        """Основная версия Chromium для ChromeDriver: YANDEX_BROWSER_VERSION или версия по умолчанию.
+
+        Версия входит в имя файла кэша, поэтому после обновления браузера
+        и смены YANDEX_BROWSER_VERSION драйвер скачивается заново автоматически.
+        """
+        return self.settings.yandex_browser_version or self.CHROMEDRIVER_VERSION_MAIN
+
+    def _driver_cache_file(self) -> Path:
+        """Путь к файлу ChromeDriver в кэше для текущей версии."""
+        suffix = ".exe" if os.name == "nt" else ""
+        return self.drivers_dir / f"chromedriver_{self._driver_version_main}{suffix}"
+
+    def _get_cached_driver_path(self) -> Optional[Path]:
+        """Возвращает путь к закэшированному ChromeDriver или None, если кэша нет.
+
+        Без явного пути undetected_chromedriver при каждом запуске удаляет драйвер,
+        запрашивает номер версии и скачивает архив заново.
+        """
+        if self._driver_path is None:
+            # Драйвер, положенный рядом с проектом, имеет приоритет над кэшем
+            vendored = self._vendored_driver_path()
+            if vendored:
+                self._driver_path = vendored
+                logger.info(f"✓ ChromeDriver из bin: {vendored}")
+            else:
+                cache_file = self._driver_cache_file()
+                if cache_file.exists():
+                    self._driver_path = cache_file
+                    logger.info(f"✓ ChromeDriver из кэша: {cache_file}")
+        return self._driver_path
+
+    def _vendored_driver_path(self) -> Optional[Path]:
+        """Возвращает ChromeDriver из папки bin проекта, если он подходит к версии браузера.
+
+        Драйвер в bin/<версия>/ подходит по расположению. У драйвера прямо в bin/
+        версия проверяется запуском chromedriver --version, чтобы не запускать
+        браузер с заведомо несовместимым драйвером.
+        """
+        version = self._driver_version_main
+        versioned = self.VENDORED_DRIVER_DIR / str(version) / self.DRIVER_FILE_NAME
+        if versioned.exists():
+            return versioned
+
+        plain = self.VENDORED_DRIVER_DIR / self.DRIVER_FILE_NAME
+        if not plain.exists():
+            return None
         try:
-            # Запуск с правильной версией ChromeDriver для Yandex 140
-            self.driver = uc.Chrome(
-                options=options,
-                browser_executable_path=str(browser_path),
-                version_main=140,
-                use_subprocess=False,
+            result = subprocess.run(
+                [str(plain), "--version"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
             )
-            
-            logger.success("✓ Браузер запущен")
-            
-            # КРИТИЧНО: Настройка папки скачивания через CDP (обернуто в try-except)
-            try:
-                self.driver.execute_cdp_cmd("Page.setDownloadBehavior", {
-                    "behavior": "allow",
-                    "downloadPath": str(self.downloads_dir.absolute())
-                })
-                logger.info(f"✓ Папка скачивания: {self.downloads_dir.absolute()}")
-            except Exception as cdp_error:
-                logger.warning(f"⚠ Не удалось установить папку скачивания через CDP: {cdp_error}")
-                logger.info("Браузер будет использовать папку скачивания по умолчанию")
-            
-            # КРИТИЧНО: Даём браузеру время на полную инициализацию перед любыми действиями
-            time.sleep(5)
-            
+            match = re.search(r"ChromeDriver (\d+)\.", result.stdout)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"⚠ Не удалось проверить версию {plain}: {e}")
+            return None
+        if not match or int(match.group(1)) != version:
+            logger.warning(f"⚠ ChromeDriver в bin не подходит к версии {version}: {result.stdout.strip()}")
+            return None
+        return plain
+
+    def _cache_driver(self) -> None:
+        """Сохраняет скачанный и пропатченный ChromeDriver в кэш для следующих запусков."""
+        try:
+            self.drivers_dir.mkdir(parents=True, exist_ok=True)
+            cache_file = self._driver_cache_file()
+            shutil.copy2(self.driver.patcher.executable_path, cache_file)
+            self._driver_path = cache_file
+            logger.info(f"✓ ChromeDriver сохранён в кэш: {cache_file}")
         except Exception as e:
-            logger.error(f"Ошибка запуска: {e}")
-            raise
+            logger.warning(f"⚠ Не удалось сохранить ChromeDriver в кэш: {e}")
 
     def _get_yandex_browser_version(self, browser_path: Path) -> Optional[int]:
         """Определяет версию Yandex Browser.
@@ -185,13 +626,144 @@ class BrowserAgent:
         return 140
 
     def close_browser(self) -> None:
-        """Закрытие браузера."""
+        """Закрытие браузера.
+
+        После driver.quit() добиваются только процессы этого агента (chromedriver,
+        браузер и их дочерние) - другие окна Yandex Browser пользователя не трогаются.
+        """
+        self._stop_download_observer()
         if self.driver:
+            # Объекты процессов собираются до quit(): после него PID может достаться
+            # чужому процессу, а psutil.Process по create_time отличает его от нашего
+            procs = self._driver_processes()
+            # quit() может зависнуть на зависшем браузере - по таймауту завершаем
+            # процессы сами, после чего quit() падает с ошибкой соединения
+            watchdog = threading.Timer(self.DRIVER_QUIT_TIMEOUT, self._kill_processes, args=(procs,))
+            watchdog.daemon = True
+            watchdog.start()
             try:
                 self.driver.quit()
                 logger.info("Браузер закрыт")
             except Exception as e:
                 logger.error(f"Ошибка при закрытии браузера: {e}")
+            finally:
+                watchdog.cancel()
+                self.driver = None
+                self._kill_processes(procs)
+
+    def _driver_processes(self) -> List[psutil.Process]:
+        """Процессы chromedriver и браузера, запущенные этим агентом, вместе с дочерними."""
+        pids = []
+        service_process = getattr(getattr(self.driver, "service", None), "process", None)
+        if service_process is not None:
+            pids.append(service_process.pid)
+        browser_pid = getattr(self.driver, "browser_pid", None)
+        if browser_pid:
+            pids.append(browser_pid)
+
+        procs: List[psutil.Process] = []
+        for pid in pids:
+            try:
+                parent = psutil.Process(pid)
+                procs.extend(parent.children(recursive=True))
+                procs.append(parent)
+            except psutil.Error:
+                continue
+        return procs
+
+    def _profile_processes(self) -> List[psutil.Process]:
+        """Процессы браузера, запущенные с папкой профиля этого агента, вместе с дочерними.
+
+        Нужны, когда драйвер не создался и его PID неизвестны: браузер ищется
+        по аргументу --user-data-dir в командной строке.
+        """
+        profile = os.path.normcase(self._profile_dir_str)
+        prefix = "--user-data-dir="
+        procs: Dict[int, psutil.Process] = {}
+        for proc in psutil.process_iter(["cmdline"]):
+            cmdline = proc.info["cmdline"] or ()
+            if not any(
+                arg.startswith(prefix)
+                and os.path.normcase(os.path.abspath(arg[len(prefix):].strip('"'))) == profile
+                for arg in cmdline
+            ):
+                continue
+            procs[proc.pid] = proc
+            try:
+                for child in proc.children(recursive=True):
+                    procs.setdefault(child.pid, child)
+            except psutil.Error:
+                pass
+        return list(procs.values())
+
+    @staticmethod
+    def _kill_processes(procs: List[psutil.Process]) -> None:
+        """Завершает ещё работающие процессы из списка.
+
+        Сначала terminate, через 3 секунды - kill для тех, кто не завершился.
+        Процессы, уже завершившиеся (в том числе чей PID занят другим процессом),
+        psutil пропускает с ошибкой NoSuchProcess.
+
+        Args:
+            procs: Процессы, собранные _driver_processes до driver.quit()
+        """
+        if not procs:
+            return
+        for proc in procs:
+            try:
+                proc.terminate()
+            except psutil.Error:
+                pass
+        _, alive = psutil.wait_procs(procs, timeout=3)
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.Error:
+                pass
+        logger.debug(f"Завершены оставшиеся процессы браузера: {len(procs)}")
+
+    def ensure_browser(self) -> bool:
+        """Запускает браузер, если он ещё не запущен или его сессия потеряна.
+
+        Уже запущенный браузер переиспользуется между вызовами execute_flow,
+        поэтому запуск (профиль, CDP) оплачивается один раз за процесс.
+
+        Returns:
+            True, если браузер был запущен заново
+        """
+        if self.driver is not None:
+            try:
+                # Дешёвая проверка, что сессия chromedriver жива
+                _ = self.driver.window_handles
+                return False
+            except WebDriverException as e:
+                logger.warning(f"⚠ Сессия браузера потеряна ({e.__class__.__name__}), перезапуск...")
+                self.close_browser()
+
+        self.start_browser()
+        return True
+
+    def __enter__(self) -> "BrowserAgent":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close_browser()
+
+    def _wait_for_page_ready(self, timeout: Optional[int] = None) -> None:
+        """Ожидание загрузки страницы: readyState=complete и скрытые индикаторы загрузки.
+
+        Если страница не успела загрузиться, пишет предупреждение и продолжает работу.
+
+        Args:
+            timeout: Таймаут ожидания (по умолчанию из настроек)
+        """
+        timeout = timeout or self.settings.element_wait_timeout
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script(self.PAGE_READY_JS, self.LOADER_SELECTORS)
+            )
+        except TimeoutException:
+            logger.warning(f"⚠ Страница не загрузилась полностью за {timeout} сек, продолжаем...")
 
     def navigate_to_url(self, url: str) -> None:
         """Переход на указанный URL.
@@ -220,7 +792,7 @@ class BrowserAgent:
                 logger.warning("Не удалось получить текущий URL, продолжаем...")
             
             # Если уже на нужной странице, обновляем её
-            if url in current_url or "seller.wildberries.ru/analytics-reports/sales" in current_url:
+            if url in current_url or _is_reports_url(current_url):
                 logger.info("Уже на странице Wildberries, обновляем страницу")
                 self.driver.refresh()
             else:
@@ -230,30 +802,18 @@ class BrowserAgent:
             
             # Ждём загрузки страницы
             logger.info("Ожидание загрузки страницы...")
-            time.sleep(self.settings.delay_page_load)
-
-            # Ожидание полной загрузки страницы
-            WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-            
-            # Дополнительная проверка - ждём пока страница действительно загрузится
-            time.sleep(2)
+            self._wait_for_page_ready()
             
             # Проверяем текущий URL после загрузки
             try:
                 final_url = self.driver.current_url
                 logger.info(f"URL после загрузки: {final_url}")
                 
-                if url not in final_url and "seller.wildberries.ru" not in final_url:
+                if url not in final_url and urlsplit(final_url).hostname != SELLER_HOST:
                     logger.warning(f"⚠ Страница не открылась правильно. Текущий URL: {final_url}")
                     logger.info("Повторная попытка открытия страницы...")
                     self.driver.get(url)
-                    time.sleep(self.settings.delay_page_load)
-                    WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
-                        lambda d: d.execute_script("return document.readyState") == "complete"
-                    )
-                    time.sleep(2)
+                    self._wait_for_page_ready()
             except Exception as e:
                 logger.warning(f"Не удалось проверить URL после загрузки: {e}")
 
@@ -265,34 +825,17 @@ class BrowserAgent:
             else:
                 logger.success("✓ Авторизация уже выполнена, пропускаем этап авторизации")
 
-            # Проверка, что мы на странице отчётов
-            # Проверяем наличие характерных элементов страницы
-            page_loaded = False
+            # Проверка, что мы на странице отчётов: поле поиска кабинетов, кнопка календаря
+            # или заголовок "Продажи" - все признаки проверяются одним JS-запросом за опрос,
+            # поэтому ожидание ограничено самым быстрым элементом, а не суммой трёх ожиданий
             try:
-                # Вариант 1: Есть поле поиска кабинетов (для пользователей с несколькими кабинетами)
-                WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.ID, "suppliers-search"))
+                # 15 секунд - как прежние три последовательных ожидания по 5
+                page_loaded = WebDriverWait(self.driver, 15, poll_frequency=self.POLL_FREQUENCY).until(
+                    lambda d: self._session_state() == "reports"
                 )
-                logger.success("✓ Страница отчётов загружена (найдено поле поиска кабинетов)")
-                page_loaded = True
+                logger.success("✓ Страница отчётов загружена")
             except TimeoutException:
-                # Вариант 2: Проверяем наличие кнопки календаря (есть у всех)
-                try:
-                    WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, 'button.Date-input__icon-button__WnbzIWQzsq'))
-                    )
-                    logger.success("✓ Страница отчётов загружена (найдена кнопка календаря)")
-                    page_loaded = True
-                except TimeoutException:
-                    # Вариант 3: Проверяем наличие заголовка "Продажи"
-                    try:
-                        WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.XPATH, "//span[text()='Продажи']"))
-                        )
-                        logger.success("✓ Страница отчётов загружена (найден заголовок 'Продажи')")
-                        page_loaded = True
-                    except TimeoutException:
-                        pass
+                page_loaded = False
             
             if not page_loaded:
                 logger.error("⚠ Не удалось найти характерные элементы страницы отчётов")
@@ -310,6 +853,23 @@ class BrowserAgent:
                 logger.error("Не удалось получить текущий URL")
             raise
 
+    def _wait_for_reports_page(self, timeout: int = 20) -> bool:
+        """Ожидание элементов страницы отчётов (поле поиска кабинетов или кнопка календаря).
+
+        Args:
+            timeout: Таймаут ожидания в секундах
+
+        Returns:
+            True, если страница отчётов открылась
+        """
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=self.POLL_FREQUENCY).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.REPORTS_PAGE_CSS))
+            )
+            return True
+        except TimeoutException:
+            return False
+
     def _check_authorization_required(self) -> bool:
         """Проверка, требуется ли авторизация.
 
@@ -317,53 +877,22 @@ class BrowserAgent:
             True если требуется авторизация, False иначе
         """
         try:
-            # Сначала проверяем, авторизованы ли мы уже (проверяем характерные элементы страницы)
-            # Вариант 1: Есть поле поиска кабинетов
-            try:
-                WebDriverWait(self.driver, 3).until(
-                    EC.presence_of_element_located((By.ID, "suppliers-search"))
-                )
-                logger.success("✓ Уже авторизованы - найдено поле поиска кабинетов")
-                return False
-            except TimeoutException:
-                pass
-            
-            # Вариант 2: Есть кнопка календаря (характерный элемент страницы отчётов)
+            # Признаки страницы отчётов и страницы входа (включая URL) проверяются одним
+            # JS-запросом за опрос вместо четырёх последовательных ожиданий по 3 секунды
             try:
-                WebDriverWait(self.driver, 3).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'button.Date-input__icon-button__WnbzIWQzsq'))
+                state = WebDriverWait(self.driver, 10, poll_frequency=0.25).until(
+                    lambda d: self._session_state()
                 )
-                logger.success("✓ Уже авторизованы - найдена кнопка календаря на странице отчётов")
-                return False
             except TimeoutException:
-                pass
-            
-            # Вариант 3: Есть заголовок "Продажи" или "Отчеты"
-            try:
-                WebDriverWait(self.driver, 3).until(
-                    EC.presence_of_element_located((By.XPATH, "//span[text()='Продажи' or text()='Отчеты']"))
-                )
-                logger.success("✓ Уже авторизованы - найден заголовок страницы отчётов")
+                state = None
+
+            if state == "reports":
+                logger.success("✓ Уже авторизованы - найдены элементы страницы отчётов")
                 return False
-            except TimeoutException:
-                pass
-            
-            # Проверяем наличие поля ввода телефона (признак страницы авторизации)
-            try:
-                WebDriverWait(self.driver, 3).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'input[data-testid="phone-input"]'))
-                )
-                logger.warning("⚠ Требуется авторизация - обнаружено поле ввода телефона")
-                return True
-            except TimeoutException:
-                pass
-            
-            # Проверяем URL - если содержит "login" или "auth", то требуется авторизация
-            current_url = self.driver.current_url
-            if "login" in current_url.lower() or "auth" in current_url.lower():
-                logger.warning(f"⚠ Требуется авторизация - URL содержит 'login' или 'auth': {current_url}")
+            if state == "auth":
+                logger.warning("⚠ Требуется авторизация - открыта страница входа")
                 return True
-            
+
             # Если ничего не найдено, считаем что авторизованы
             logger.info("Проверка авторизации: элементы страницы авторизации не найдены, считаем что авторизованы")
             return False
@@ -373,6 +902,14 @@ class BrowserAgent:
             # В случае ошибки считаем, что авторизация требуется
             return True
 
+    def _find_auth_elements(self) -> list:
+        """Ищет элементы формы входа одним JS-запросом.
+
+        Returns:
+            [поле телефона, поле кода, кнопка отправки] - видимые элементы или None
+        """
+        return self.driver.execute_script(self.AUTH_ELEMENTS_JS, *self.AUTH_SELECTORS)
+
     def _perform_authorization(self) -> None:
         """Выполнение авторизации."""
         try:
@@ -383,63 +920,40 @@ class BrowserAgent:
 
             # Шаг 1: Ввод номера телефона
             logger.info("Ввод номера телефона")
-            phone_input = WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'input[data-testid="phone-input"]'))
+            phone_input = WebDriverWait(self.driver, self.settings.element_wait_timeout, poll_frequency=self.POLL_FREQUENCY).until(
+                lambda d: self._find_auth_elements()[0]
             )
-            time.sleep(self.settings.delay_before_click)  # Задержка перед кликом
-            phone_input.click()
-            time.sleep(self.settings.delay_after_click)  # Задержка после клика
+            self._click_with_delays(phone_input)
             phone_input.clear()
-            time.sleep(0.5)
 
-            # Ввод номера телефона посимвольно
-            # Убираем все символы кроме цифр
-            phone_number_clean = ''.join(filter(str.isdigit, self.settings.phone_number))
-            
-            # Убираем +7 в начале, если есть (оставляем только цифры после +7)
-            if phone_number_clean.startswith('7') and len(phone_number_clean) == 11:
-                phone_number_clean = phone_number_clean[1:]  # Убираем первую 7
-            elif phone_number_clean.startswith('7') and len(phone_number_clean) > 11:
-                phone_number_clean = phone_number_clean[1:]  # Убираем первую 7
-            
+            # Убираем все символы кроме цифр и код страны 7 в начале (оставляем цифры после +7)
+            phone_number_clean = _NON_DIGIT_RE.sub("", self.settings.phone_number)
+            if phone_number_clean.startswith("7") and len(phone_number_clean) >= 11:
+                phone_number_clean = phone_number_clean[1:]
+
             # Вводим только цифры (без +7)
-            for char in phone_number_clean:
-                phone_input.send_keys(char)
-                time.sleep(self.settings.delay_between_keys)
+            self._type_auth_field(phone_input, phone_number_clean)
 
             logger.success(f"✓ Номер телефона введён: {phone_number_clean}")
 
             # Шаг 2: Нажатие кнопки отправки (стрелка)
             logger.info("Нажатие кнопки отправки номера")
-            # Пробуем найти кнопку по разным селекторам
-            try:
-                submit_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-testid="submit-phone-button"]'))
-                )
-            except TimeoutException:
-                # Если не нашли, пробуем найти по изображению стрелки
-                try:
-                    submit_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, 'img[alt=""][class*="FormPhoneInputBorderless__image"]'))
-                    )
-                except TimeoutException:
-                    # Пробуем найти родительский элемент (кнопку с изображением)
-                    submit_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, '//img[contains(@class, "FormPhoneInputBorderless__image")]/parent::button | //img[contains(@class, "FormPhoneInputBorderless__image")]/ancestor::button'))
-                    )
+            # Все варианты кнопки (по data-testid, кнопка со стрелкой, сама стрелка) - одним
+            # XPath-объединением: одно ожидание вместо трёх последовательных по 5 секунд.
+            # Кнопка в документе идёт раньше вложенной картинки, поэтому находится первой
+            submit_button = WebDriverWait(self.driver, 10).until(
+                EC.element_to_be_clickable((By.XPATH, self.SUBMIT_PHONE_XPATH))
+            )
             
-            time.sleep(self.settings.delay_before_click)  # Задержка перед кликом
-            submit_button.click()
-            time.sleep(self.settings.delay_after_click)  # Задержка после клика
+            self._click_with_delays(submit_button)
             logger.success("✓ Кнопка отправки нажата")
 
-            time.sleep(2)  # Ожидание загрузки формы ввода кода
-
+            # Форма ввода кода: ожидание поля ниже вместо фиксированной паузы
             # Шаг 3: Запрос первого кода авторизации
             logger.info("Ожидание поля для ввода кода авторизации")
             # Ищем поле по селектору из алгоритма
-            code_input = WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div.FormTextInput__input-f6fPmoYx4c input[type="numeric"], input[type="numeric"]'))
+            code_input = WebDriverWait(self.driver, self.settings.element_wait_timeout, poll_frequency=self.POLL_FREQUENCY).until(
+                lambda d: self._find_auth_elements()[1]
             )
 
             # Запрашиваем код у пользователя
@@ -450,43 +964,43 @@ class BrowserAgent:
             code1 = input("Введите код авторизации (6 символов): ").strip()
 
             # Ввод первого кода
-            time.sleep(self.settings.delay_before_click)  # Задержка перед кликом
-            code_input.click()
-            time.sleep(self.settings.delay_after_click)  # Задержка после клика
+            self._click_with_delays(code_input)
             code_input.clear()
-            time.sleep(0.5)
-            for char in code1:
-                code_input.send_keys(char)
-                time.sleep(self.settings.delay_between_keys)
+            self._type_auth_field(code_input, code1)
+            # Значение поля с первым кодом: по его смене видно, что открылась форма второго кода
+            first_code_value = code_input.get_attribute("value")
 
             logger.success("✓ Первый код введён")
 
             # Нажатие кнопки отправки (если есть)
             try:
-                submit_code_button = WebDriverWait(self.driver, 3).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[type="submit"]'))
+                submit_code_button = WebDriverWait(self.driver, 3, poll_frequency=self.POLL_FREQUENCY).until(
+                    lambda d: self._find_auth_elements()[2]
                 )
-                time.sleep(self.settings.delay_before_click)  # Задержка перед кликом
-                submit_code_button.click()
-                time.sleep(self.settings.delay_after_click)  # Задержка после клика
-                time.sleep(2)
+                self._click_with_delays(submit_code_button)
             except TimeoutException:
                 # Кнопка может отсутствовать, код может отправляться автоматически
                 pass
 
             # Шаг 4: Запрос второго кода (код на почту)
             logger.info("Ожидание поля для ввода второго кода")
-            time.sleep(2)
+            # Ждём, пока поле первого кода пропадёт или очистится (форма сменилась),
+            # иначе второй код можно ввести в старое поле
+            try:
+                WebDriverWait(self.driver, 5, poll_frequency=self.POLL_FREQUENCY).until(
+                    lambda d: self._field_value_changed(code_input, first_code_value)
+                )
+            except TimeoutException:
+                pass
 
             # Ищем поле для второго кода (может быть то же самое или новое)
             try:
-                code_input2 = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'div.FormTextInput__input-f6fPmoYx4c input[type="numeric"], input[type="numeric"]'))
+                code_input2 = WebDriverWait(self.driver, 5, poll_frequency=self.POLL_FREQUENCY).until(
+                    lambda d: self._find_auth_elements()[1]
                 )
             except TimeoutException:
                 # Если поле не найдено, возможно авторизация завершена
                 logger.info("Поле для второго кода не найдено, проверяем авторизацию...")
-                time.sleep(2)
                 if not self._check_authorization_required():
                     logger.success("✓ Авторизация завершена")
                     return
@@ -499,32 +1013,31 @@ class BrowserAgent:
             code2 = input("Введите код авторизации с почты (6 символов): ").strip()
 
             # Ввод второго кода
-            time.sleep(self.settings.delay_before_click)  # Задержка перед кликом
-            code_input2.click()
-            time.sleep(self.settings.delay_after_click)  # Задержка после клика
+            self._click_with_delays(code_input2)
             code_input2.clear()
-            time.sleep(0.5)
-            for char in code2:
-                code_input2.send_keys(char)
-                time.sleep(self.settings.delay_between_keys)
+            self._type_auth_field(code_input2, code2)
 
             logger.success("✓ Второй код введён")
 
             # Нажатие кнопки входа
             try:
-                login_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[type="submit"]'))
+                login_button = WebDriverWait(self.driver, 5, poll_frequency=self.POLL_FREQUENCY).until(
+                    lambda d: self._find_auth_elements()[2]
                 )
-                time.sleep(self.settings.delay_before_click)  # Задержка перед кликом
-                login_button.click()
-                time.sleep(self.settings.delay_after_click)  # Задержка после клика
+                self._click_with_delays(login_button)
                 logger.success("✓ Кнопка входа нажата")
             except TimeoutException:
                 # Кнопка может отсутствовать, авторизация может завершиться автоматически
                 pass
 
-            # Ожидание завершения авторизации и перехода на страницу отчётов
-            time.sleep(5)
+            # Ожидание завершения авторизации: уход со страницы входа или элементы отчётов
+            try:
+                WebDriverWait(self.driver, 20, poll_frequency=0.25).until(
+                    lambda d: not _is_auth_url(d.current_url)
+                    or self._session_state() == "reports"
+                )
+            except TimeoutException:
+                pass
 
             # Проверяем, что авторизация завершена
             if self._check_authorization_required():
@@ -533,10 +1046,10 @@ class BrowserAgent:
 
             # Переходим на страницу отчётов, если мы не на ней
             current_url = self.driver.current_url
-            if "analytics-reports/sales" not in current_url:
+            if not _is_reports_url(current_url):
                 logger.info("Переход на страницу отчётов после авторизации")
                 self.driver.get(self.settings.wildberries_start_url)
-                time.sleep(self.settings.delay_page_load)
+                self._wait_for_page_ready()
 
             logger.success("✓ Авторизация завершена")
 
@@ -545,85 +1058,224 @@ class BrowserAgent:
             logger.exception("Детали ошибки:")
             raise
 
-    def wait_for_element(self, by: By, value: str, timeout: Optional[int] = None) -> None:
-        """Ожидание появления элемента на странице.
+    def _click_with_delays(self, element) -> None:
+        """Клик по элементу формы входа с паузами до и после (delay_before_click/delay_after_click).
+
+        В режиме fast_mode паузы пропускаются: следующий шаг авторизации
+        и так ждёт нужный элемент.
 
         Args:
-            by: Тип селектора (By.ID, By.CLASS_NAME и т.д.)
-            value: Значение селектора
-            timeout: Таймаут ожидания (по умолчанию из настроек)
+            element: Элемент для клика
         """
-        timeout = timeout or self.settings.element_wait_timeout
+        if not self.settings.fast_mode:
+            time.sleep(self.settings.delay_before_click)
+        element.click()
+        if not self.settings.fast_mode:
+            time.sleep(self.settings.delay_after_click)
+
+    def _session_state(self) -> Optional[str]:
+        """Состояние сессии одним JS-запросом: "reports", "auth" или None (см. SESSION_STATE_JS)."""
+        return self.driver.execute_script(self.SESSION_STATE_JS, self.REPORTS_PAGE_CSS)
+
+    @staticmethod
+    def _field_value_changed(element, old_value: Optional[str]) -> bool:
+        """Изменилось ли значение поля (или поле пропало из DOM)."""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by, value))
-            )
-        except TimeoutException:
-            logger.error(f"Элемент не найден: {by}={value}")
-            raise
+            return element.get_attribute("value") != old_value
+        except StaleElementReferenceException:
+            return True
 
-    def click_element(self, by: By, value: str, scroll: bool = True) -> None:
-        """Клик по элементу.
+    def _set_input_value(self, element, text: str) -> None:
+        """Задаёт значение поля одним JS-вызовом (режим fast_mode).
 
         Args:
-            by: Тип селектора
-            value: Значение селектора
-            scroll: Прокрутить страницу к элементу перед кликом
+            element: Поле ввода
+            text: Значение поля
         """
-        try:
-            time.sleep(self.settings.delay_before_click)
-            element = WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
-                EC.element_to_be_clickable((by, value))
-            )
+        self.driver.execute_script(self.SET_INPUT_VALUE_JS, element, text)
 
-            if scroll:
-                self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                time.sleep(0.5)
+    def _insert_text(self, element, text: str) -> None:
+        """Вставляет текст в поле с фокусом одной командой CDP Input.insertText.
 
-            element.click()
-            time.sleep(self.settings.delay_after_click)
-            logger.debug(f"Клик по элементу: {by}={value}")
+        Браузер генерирует настоящее событие ввода (как при вставке), поэтому
+        маски полей его обрабатывают, а вместо серии нажатий клавиш - один запрос.
+        Если команда CDP недоступна, текст вводится через send_keys.
 
-        except Exception as e:
-            logger.error(f"Ошибка при клике по элементу {by}={value}: {e}")
-            raise
+        Args:
+            element: Поле ввода (уже в фокусе)
+            text: Текст для ввода
+        """
+        try:
+            self.driver.execute_cdp_cmd("Input.insertText", {"text": text})
+        except WebDriverException:
+            element.send_keys(text)
 
-    def fill_input(self, by: By, value: str, text: str, clear: bool = True, scroll: bool = True) -> None:
-        """Заполнение поля ввода.
+    def _type_auth_field(self, element, text: str) -> None:
+        """Ввод номера телефона или кода авторизации в поле с фокусом.
+
+        В режиме fast_mode текст вставляется одной командой CDP (маска поля получает
+        настоящее событие ввода), иначе - порциями через _type_like_human.
 
         Args:
-            by: Тип селектора
-            value: Значение селектора
+            element: Поле ввода (уже в фокусе)
             text: Текст для ввода
-            clear: Очистить поле перед вводом
-            scroll: Прокрутить страницу к элементу перед вводом
         """
-        # Повторные попытки при StaleElementReferenceException
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                time.sleep(self.settings.delay_before_type)
-                
+        if self.settings.fast_mode:
+            self._insert_text(element, text)
+        else:
+            self._type_like_human(element, text)
+
+    def _type_like_human(self, element, text: str) -> None:
+        """Ввод текста порциями по 3-5 символов со случайными паузами.
+
+        Задержки на все символы выбираются заранее одним вызовом, после каждой
+        порции выполняется одна пауза на их сумму - в несколько раз меньше
+        запросов к chromedriver, чем при посимвольном вводе, а темп остаётся
+        похожим на человеческий.
+
+        Args:
+            element: Поле ввода
+            text: Текст для ввода
+        """
+        delays = [random.uniform(0.05, self.settings.delay_between_keys) for _ in text]
+        pos = 0
+        while pos < len(text):
+            size = random.randint(3, 5)
+            element.send_keys(text[pos:pos + size])
+            time.sleep(sum(delays[pos:pos + size]))
+            pos += size
+
+    def _wait_for_first_clickable(self, locators, timeout: float) -> Tuple[object, int]:
+        """Ожидание первого кликабельного элемента из нескольких вариантов локатора.
+
+        Все варианты проверяются через find_elements (без ожидания) за каждый опрос,
+        поэтому запасной вариант не ждёт окончания таймаута основного.
+
+        Args:
+            locators: Пары (By, селектор) в порядке предпочтения
+            timeout: Общий таймаут ожидания
+
+        Returns:
+            Найденный элемент и номер сработавшего локатора
+
+        Raises:
+            TimeoutException: Ни один вариант не стал кликабельным за timeout
+        """
+        def first_clickable(driver):
+            for index, locator in enumerate(locators):
+                for element in driver.find_elements(*locator):
+                    if element.is_displayed() and element.is_enabled():
+                        return element, index
+            return False
+
+        return WebDriverWait(
+            self.driver, timeout, poll_frequency=self.POLL_FREQUENCY,
+            ignored_exceptions=(StaleElementReferenceException,),
+        ).until(first_clickable)
+
+    def _wait_after_click(self, element, timeout: int = 3) -> None:
+        """Ожидание результата клика вместо фиксированной паузы.
+
+        Ждёт, пока элемент пропадёт из DOM (меню закрылось, строка удалена),
+        затем - пока страница не скроет индикаторы загрузки.
+
+        Args:
+            element: Элемент, по которому кликнули
+            timeout: Сколько ждать исчезновения элемента
+        """
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=self.POLL_FREQUENCY).until(
+                EC.staleness_of(element)
+            )
+        except TimeoutException:
+            pass
+        self._wait_for_page_ready()
+
+    def wait_for_element(self, by: By, value: str, timeout: Optional[int] = None) -> None:
+        """Ожидание появления элемента на странице.
+
+        Args:
+            by: Тип селектора (By.ID, By.CLASS_NAME и т.д.)
+            value: Значение селектора
+            timeout: Таймаут ожидания (по умолчанию из настроек)
+        """
+        timeout = timeout or self.settings.element_wait_timeout
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=self.POLL_FREQUENCY).until(
+                EC.presence_of_element_located((by, value))
+            )
+        except TimeoutException:
+            logger.error(f"Элемент не найден: {by}={value}")
+            raise
+
+    def click_element(self, by: By, value: str, scroll: bool = True) -> None:
+        """Клик по элементу.
+
+        Args:
+            by: Тип селектора
+            value: Значение селектора
+            scroll: Прокрутить страницу к элементу перед кликом
+        """
+        try:
+            # Вместо фиксированных пауз до/после клика ждём, пока элемент станет кликабельным
+            element = WebDriverWait(
+                self.driver, self.settings.element_wait_timeout, poll_frequency=self.POLL_FREQUENCY
+            ).until(
+                EC.element_to_be_clickable((by, value))
+            )
+
+            if scroll:
+                # scrollIntoView с behavior: instant синхронный - пауза после него не нужна
+                self.driver.execute_script(self.SCROLL_INTO_VIEW_JS, element)
+
+            element.click()
+            logger.debug(f"Клик по элементу: {by}={value}")
+
+        except Exception as e:
+            logger.error(f"Ошибка при клике по элементу {by}={value}: {e}")
+            raise
+
+    def fill_input(
+        self, by: By, value: str, text: str, clear: bool = True, scroll: bool = True, human_like: bool = False
+    ) -> None:
+        """Заполнение поля ввода.
+
+        Args:
+            by: Тип селектора
+            value: Значение селектора
+            text: Текст для ввода
+            clear: Очистить поле перед вводом
+            scroll: Прокрутить страницу к элементу перед вводом
+            human_like: Посимвольный ввод с задержками (для полей, которым нужны события клавиш)
+        """
+        # Повторные попытки при StaleElementReferenceException
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
                 # ВСЕГДА ищем элемент заново (защита от stale element)
-                element = WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
+                element = WebDriverWait(
+                    self.driver, self.settings.element_wait_timeout, poll_frequency=self.POLL_FREQUENCY
+                ).until(
                     EC.presence_of_element_located((by, value))
                 )
 
                 if scroll:
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                    time.sleep(0.5)
+                    # scrollIntoView с behavior: instant синхронный - пауза после него не нужна
+                    self.driver.execute_script(self.SCROLL_INTO_VIEW_JS, element)
 
                 if clear:
                     # Используем JavaScript для очистки (надёжнее)
+                    # execute_script синхронный - пауза после него не нужна
                     self.driver.execute_script("arguments[0].value = '';", element)
-                    time.sleep(0.3)
 
-                # Посимвольный ввод для имитации человеческого поведения
-                for char in text:
-                    element.send_keys(char)
-                    time.sleep(self.settings.delay_between_keys)
+                if human_like:
+                    self._type_like_human(element, text)
+                elif self.settings.fast_mode:
+                    self._set_input_value(element, text)
+                else:
+                    # Весь текст одной командой - один запрос к chromedriver вместо N
+                    element.send_keys(text)
 
-                time.sleep(self.settings.delay_after_type)
                 logger.debug(f"Заполнено поле {by}={value}: {text}")
                 return  # Успешно - выходим
 
@@ -648,7 +1300,7 @@ class BrowserAgent:
             logger.info("   Поиск кнопок удаления отчётов...")
             
             # Ждём загрузки страницы
-            time.sleep(2)
+            self._wait_for_page_ready()
             
             # Ищем все кнопки удаления по селектору из HTML
             # Кнопка содержит SVG с path для корзины (более стабильный способ поиска)
@@ -733,18 +1385,14 @@ class BrowserAgent:
                 try:
                     logger.info(f"     Удаляем отчёт {i}/{len(delete_buttons)}...")
                     # Прокручиваем к кнопке
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
-                    time.sleep(0.5)
+                    # scrollIntoView с behavior: instant синхронный - пауза после него не нужна
+                    self.driver.execute_script(self.SCROLL_INTO_VIEW_JS, button)
                     
-                    # Нажимаем на кнопку
-                    time.sleep(self.settings.delay_before_click)
+                    # Нажимаем на кнопку и ждём, пока строка отчёта исчезнет
                     button.click()
-                    time.sleep(self.settings.delay_after_click)
+                    self._wait_after_click(button)
                     deleted_count += 1
                     logger.info(f"     ✓ Отчёт {i} удалён")
-                    
-                    # Небольшая задержка между удалениями
-                    time.sleep(1)
                 except Exception as e:
                     logger.warning(f"     ⚠ Не удалось удалить отчёт {i}: {e}")
                     continue
@@ -753,7 +1401,7 @@ class BrowserAgent:
             
             # Ждём обновления страницы после удаления
             logger.info("   Ожидание обновления страницы...")
-            time.sleep(2)
+            self._wait_for_page_ready()
             
         except Exception as e:
             logger.error(f"Ошибка при удалении отчётов: {e}")
@@ -770,16 +1418,32 @@ class BrowserAgent:
         Returns:
             Путь к обработанному файлу или None в случае ошибки
         """
+        downloaded_file, date_str = self._download_report(cabinet, target_date)
+        if not downloaded_file:
+            return None
+        return self._postprocess_report(downloaded_file, cabinet["name"], date_str)
+
+    @staticmethod
+    def _report_date_str(target_date: Optional[date] = None) -> str:
+        """Дата отчёта в формате DD.MM.YYYY (если target_date не задана - вчерашний день)."""
+        report_date = target_date or (datetime.now() - timedelta(days=1)).date()
+        return report_date.strftime("%d.%m.%Y")
+
+    def _download_report(
+        self, cabinet: Dict[str, str], target_date: Optional[date] = None
+    ) -> Tuple[Optional[Path], str]:
+        """Скачивание отчёта кабинета в браузере (шаги 1-5 обработки кабинета).
+
+        Args:
+            cabinet: Словарь с информацией о кабинете (name, id)
+            target_date: Дата для скачивания отчёта (если None, используется вчерашний день)
+
+        Returns:
+            Кортеж (путь к скачанному файлу или None в случае ошибки, дата в формате DD.MM.YYYY)
+        """
         cabinet_name = cabinet["name"]
         cabinet_id = cabinet["id"]
-        
-        # Определяем дату для скачивания
-        if target_date:
-            report_date = target_date
-        else:
-            report_date = (datetime.now() - timedelta(days=1)).date()
-        
-        date_str = report_date.strftime("%d.%m.%Y")
+        date_str = self._report_date_str(target_date)
 
         logger.info("=" * 70)
         logger.info(f"📋 НАЧАЛО ОБРАБОТКИ КАБИНЕТА: {cabinet_name.upper()}")
@@ -796,12 +1460,10 @@ class BrowserAgent:
                 # Ищем кнопку с именем пользователя/кабинета (содержит стрелку вниз)
                 # Используем data-testid для надёжности
                 dropdown_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-testid="desktop-profile-select-button-chips-component"]'))
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, self.PROFILE_BUTTON_CSS))
                 )
                 logger.info("   ✓ Кнопка найдена, кликаем...")
-                time.sleep(self.settings.delay_before_click)
                 dropdown_button.click()
-                time.sleep(self.settings.delay_after_click)
                 logger.success("   ✅ Меню выбора кабинетов раскрыто")
             except TimeoutException:
                 logger.warning("   ⚠ Кнопка раскрытия меню не найдена, возможно меню уже раскрыто")
@@ -815,17 +1477,16 @@ class BrowserAgent:
             try:
                 logger.info("   Ожидание появления поля поиска...")
                 WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.ID, "suppliers-search"))
+                    EC.presence_of_element_located((By.ID, self.SUPPLIERS_SEARCH_ID))
                 )
                 logger.info("   ✓ Поле поиска появилось")
-                time.sleep(1)  # Дополнительная задержка для стабильности
             except TimeoutException:
                 logger.warning("   ⚠ Поле поиска не появилось, пробуем продолжить...")
             
             logger.info(f"   Вводим ID кабинета: {cabinet_id}")
             self.fill_input(
                 By.ID,
-                "suppliers-search",
+                self.SUPPLIERS_SEARCH_ID,
                 cabinet_id,
                 clear=True
             )
@@ -835,34 +1496,12 @@ class BrowserAgent:
             # КРИТИЧНО: Нажимаем на найденный кабинет
             logger.info(f"   Кликаем на найденный кабинет {cabinet_id}...")
             try:
-                # Вариант 1: Пробуем кликнуть на label кабинета
-                try:
-                    cabinet_label = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, 'label.suppliers-item-new_SuppliersItem__label__j6lv6'))
-                    )
-                    time.sleep(self.settings.delay_before_click)
-                    cabinet_label.click()
-                    time.sleep(self.settings.delay_after_click)
-                    logger.success(f"   ✅ Кабинет {cabinet_id} выбран (через label)")
-                except:
-                    # Вариант 2: Пробуем кликнуть на checkbox label
-                    try:
-                        checkbox_label = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, 'label[data-testid="supplier-checkbox-checkbox"]'))
-                        )
-                        time.sleep(self.settings.delay_before_click)
-                        checkbox_label.click()
-                        time.sleep(self.settings.delay_after_click)
-                        logger.success(f"   ✅ Кабинет {cabinet_id} выбран (через checkbox label)")
-                    except:
-                        # Вариант 3: Последняя попытка - кликаем на сам input
-                        cabinet_input = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[data-testid="supplier-checkbox-checkbox-input"]'))
-                        )
-                        time.sleep(self.settings.delay_before_click)
-                        cabinet_input.click()
-                        time.sleep(self.settings.delay_after_click)
-                        logger.success(f"   ✅ Кабинет {cabinet_id} выбран (через input)")
+                # Все варианты элемента кабинета проверяются за один опрос: одно ожидание
+                # вместо трёх последовательных по 5 секунд
+                cabinet_choice, index = self._wait_for_first_clickable(self.CABINET_CHOICE_LOCATORS, 5)
+                cabinet_choice.click()
+                self._wait_after_click(cabinet_choice)
+                logger.success(f"   ✅ Кабинет {cabinet_id} выбран (через {self.CABINET_CHOICE_NAMES[index]})")
             except Exception as e:
                 logger.warning(f"   ⚠ Не удалось кликнуть на кабинет {cabinet_id}: {e}, продолжаем...")
 
@@ -877,38 +1516,32 @@ class BrowserAgent:
             logger.info("🔹 ШАГ 4: Настройка периода отчёта")
             logger.info(f"   Устанавливаем дату: {date_str}")
             logger.info("   Ищем кнопку календаря...")
-            self.click_element(By.CSS_SELECTOR, "button.Date-input__icon-button__WnbzIWQzsq")
+            self.click_element(By.CSS_SELECTOR, self.CALENDAR_BUTTON_CSS)
             logger.info("   ✓ Кнопка календаря нажата")
 
             # Ожидание появления календаря и полей ввода даты
             logger.info("   Ожидание появления полей ввода даты...")
             try:
-                WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
-                    EC.presence_of_element_located((By.ID, "startDate"))
-                )
-                WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
-                    EC.presence_of_element_located((By.ID, "endDate"))
+                # Оба поля одним ожиданием: один запрос к chromedriver за опрос
+                WebDriverWait(self.driver, self.settings.element_wait_timeout, poll_frequency=self.POLL_FREQUENCY).until(
+                    lambda d: len(d.find_elements(By.CSS_SELECTOR, "#startDate, #endDate")) == 2
                 )
                 logger.info("   ✓ Поля ввода даты найдены")
             except TimeoutException:
                 logger.error("   ❌ Поля ввода даты не найдены")
                 raise
 
-            time.sleep(0.5)
-
             # Заполнение поля начала периода
             logger.info(f"   Заполняем поле 'Начало периода': {date_str}")
             start_date_input = WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
                 EC.element_to_be_clickable((By.ID, "startDate"))
             )
-            time.sleep(self.settings.delay_before_click)  # Задержка перед кликом
-            start_date_input.click()
-            time.sleep(self.settings.delay_after_click)  # Задержка после клика
-            start_date_input.clear()
-            time.sleep(0.5)
-            for char in date_str:
-                start_date_input.send_keys(char)
-                time.sleep(self.settings.delay_between_keys)
+            if self.settings.fast_mode:
+                self._set_input_value(start_date_input, date_str)
+            else:
+                start_date_input.click()
+                start_date_input.clear()
+                self._insert_text(start_date_input, date_str)
             logger.info("   ✓ Поле 'Начало периода' заполнено")
 
             # Заполнение поля окончания периода
@@ -916,46 +1549,52 @@ class BrowserAgent:
             end_date_input = WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
                 EC.element_to_be_clickable((By.ID, "endDate"))
             )
-            time.sleep(self.settings.delay_before_click)  # Задержка перед кликом
-            end_date_input.click()
-            time.sleep(self.settings.delay_after_click)  # Задержка после клика
-            end_date_input.clear()
-            time.sleep(0.5)
-            for char in date_str:
-                end_date_input.send_keys(char)
-                time.sleep(self.settings.delay_between_keys)
+            if self.settings.fast_mode:
+                self._set_input_value(end_date_input, date_str)
+            else:
+                end_date_input.click()
+                end_date_input.clear()
+                self._insert_text(end_date_input, date_str)
             logger.info("   ✓ Поле 'Конец периода' заполнено")
 
             # Нажатие кнопки "Сохранить"
             logger.info("   Ищем кнопку 'Сохранить'...")
             # Используем более точный селектор с текстом "Сохранить"
             save_button = WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[@type='submit' and .//span[text()='Сохранить']]"))
+                EC.element_to_be_clickable((By.XPATH, self.SAVE_PERIOD_XPATH))
             )
-            time.sleep(self.settings.delay_before_click)  # Задержка перед кликом
+            # Следующий шаг сам ждёт результата клика, отдельные паузы не нужны
             save_button.click()
-            time.sleep(self.settings.delay_after_click)  # Задержка после клика
             logger.success("   ✅ Период сохранён")
 
             # Шаг 2.4: Выгрузка отчёта
             logger.info("")
             logger.info("🔹 ШАГ 5: Выгрузка отчёта в Excel")
             logger.info("   Ожидание после сохранения периода...")
-            time.sleep(3)  # Ожидание после сохранения периода
+            # Ждём, пока страница перестанет показывать индикатор загрузки, вместо паузы 3 с
+            try:
+                WebDriverWait(self.driver, self.settings.element_wait_timeout, poll_frequency=0.25).until(
+                    lambda d: not d.execute_script(self.VISIBLE_LOADER_JS, self.LOADER_SELECTORS)
+                )
+            except TimeoutException:
+                logger.warning("   ⚠ Индикатор загрузки не исчез, продолжаем...")
+
+            # Предыдущий отчёт может ещё обрабатываться в фоне - дожидаемся перед очисткой папки
+            self._wait_for_postprocessing()
 
             # Очищаем папку downloads перед скачиванием (чтобы найти только новый файл)
             logger.info("   Очищаем папку downloads от старых файлов...")
             self._clear_downloads_folder()
+            self._reset_download_events()
             
             # Поиск кнопки "Выгрузить в Excel"
             logger.info("   Ищем кнопку 'Выгрузить в Excel'...")
-            download_button = WebDriverWait(self.driver, self.settings.element_wait_timeout).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[.//span[text()='Выгрузить в Excel']]"))
+            download_button, _ = self._wait_for_first_clickable(
+                self.DOWNLOAD_BUTTON_LOCATORS, self.settings.element_wait_timeout
             )
             logger.info("   ✓ Кнопка найдена, нажимаем...")
-            time.sleep(self.settings.delay_before_click)  # Задержка перед кликом
+            # Следующий шаг сам ждёт результата клика, отдельные паузы не нужны
             download_button.click()
-            time.sleep(self.settings.delay_after_click)  # Задержка после клика
             logger.success("   ✅ Запрос на выгрузку отправлен")
 
             # Ожидание скачивания файла
@@ -963,9 +1602,27 @@ class BrowserAgent:
             downloaded_file = self._wait_for_downloaded_file()
             if not downloaded_file:
                 logger.error("   ❌ Файл не был скачан")
-                return None
+                return None, date_str
             logger.info(f"   ✓ Файл скачан: {downloaded_file.name}")
+            return downloaded_file, date_str
+
+        except Exception as e:
+            logger.error(f"Ошибка при обработке кабинета {cabinet_name}: {e}")
+            logger.exception("Детали ошибки:")
+            return None, date_str
+
+    def _postprocess_report(self, downloaded_file: Path, cabinet_name: str, date_str: str) -> Optional[Path]:
+        """Обработка скачанного отчёта без браузера: переименование, заголовки, резервная копия.
 
+        Args:
+            downloaded_file: Путь к скачанному файлу
+            cabinet_name: Название кабинета
+            date_str: Дата в формате DD.MM.YYYY
+
+        Returns:
+            Путь к обработанному файлу или None в случае ошибки
+        """
+        try:
             # Шаг 2.4: Обработка скачанного файла
             logger.info("")
             logger.info("🔹 ШАГ 6: Обработка скачанного файла")
@@ -998,10 +1655,20 @@ class BrowserAgent:
             logger.exception("Детали ошибки:")
             return None
 
+    def _wait_for_postprocessing(self) -> None:
+        """Дожидается фоновой обработки предыдущего отчёта (результат забирает _process_cabinets)."""
+        if self._postprocess_future is not None:
+            futures_wait([self._postprocess_future])
+
     def _clear_downloads_folder(self) -> None:
         """Очищает папку downloads от старых файлов перед скачиванием."""
         try:
-            files_before = list(self.downloads_dir.glob("*.xlsx")) + list(self.downloads_dir.glob("*.xls"))
+            # Один проход scandir вместо двух glob по расширениям
+            with os.scandir(self.downloads_dir) as entries:
+                files_before = [
+                    Path(entry.path) for entry in entries
+                    if entry.name.lower().endswith(REPORT_SUFFIXES) and entry.is_file()
+                ]
             if files_before:
                 logger.info(f"   Найдено старых файлов: {len(files_before)}")
                 for old_file in files_before:
@@ -1016,51 +1683,149 @@ class BrowserAgent:
         except Exception as e:
             logger.warning(f"   ⚠ Ошибка при очистке папки downloads: {e}")
 
+    def _on_download_will_begin(self, message: Dict) -> None:
+        """CDP: начало скачивания - запоминаем имя файла по guid загрузки."""
+        params = message.get("params", {})
+        if params.get("guid") and params.get("suggestedFilename"):
+            self._download_names[params["guid"]] = params["suggestedFilename"]
+
+    def _on_download_progress(self, message: Dict) -> None:
+        """CDP: ход скачивания - по завершении передаём путь файла ожидающему."""
+        params = message.get("params", {})
+        if params.get("state") != "completed":
+            return
+        self._download_done.set()
+        # Имя файла берём у той загрузки, которая завершилась (guid из downloadWillBegin)
+        name = self._download_names.pop(params.get("guid"), None)
+        if name:
+            self._downloads.put((self.downloads_dir / name, True))
+
+    def _start_download_observer(self) -> None:
+        """Запускает наблюдение за папкой скачивания (если ещё не запущено).
+
+        Наблюдатель живёт до закрытия браузера: события о новом файле приходят
+        сразу, без запуска и остановки потока watchdog для каждого кабинета.
+        """
+        if self._observer is None:
+            self._observer = Observer()
+            self._observer.schedule(_DownloadEventHandler(self._downloads), self._downloads_dir_str, recursive=False)
+            self._observer.start()
+
+    def _stop_download_observer(self) -> None:
+        """Останавливает наблюдение за папкой скачивания."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def _reset_download_events(self) -> None:
+        """Сбрасывает события предыдущего скачивания перед новым."""
+        self._start_download_observer()
+        self._download_done.clear()
+        self._download_names.clear()
+        # Файлы, которые не удалось удалить при очистке папки, не примем за новое скачивание
+        self._files_before = frozenset(self._scan_downloads()[1].items())
+        while not self._downloads.empty():
+            self._downloads.get_nowait()
+
     def _wait_for_downloaded_file(self, timeout: int = 60) -> Optional[Path]:
         """Ожидание скачивания файла.
 
+        Вместо ежесекундного опроса папки ждём событий: CDP downloadProgress
+        со state=completed от браузера или событий файловой системы (watchdog) -
+        браузер пишет во временный .crdownload и по окончании переименовывает его
+        в .xlsx/.xls. Что придёт раньше, то и используется.
+
         Args:
             timeout: Таймаут ожидания в секундах
 
         Returns:
             Путь к скачанному файлу или None
         """
-        start_time = time.time()
         logger.info(f"   Ожидание до {timeout} секунд...")
-        check_count = 0
-        
-        while time.time() - start_time < timeout:
-            check_count += 1
-            if check_count % 5 == 0:  # Каждые 5 секунд показываем прогресс
-                elapsed = int(time.time() - start_time)
-                logger.info(f"   Ожидание... ({elapsed}/{timeout} сек)")
-            
-            # Ищем файлы .xlsx и .xls в папке downloads
-            for file_path in self.downloads_dir.glob("*.xlsx"):
-                # Проверяем, что файл не заблокирован (завершено скачивание)
-                try:
-                    if file_path.stat().st_size > 0:
-                        # Проверяем, что файл не был изменён недавно (скачивание завершено)
-                        if time.time() - file_path.stat().st_mtime > 2:
-                            logger.info(f"   ✓ Найден новый файл: {file_path.name} ({file_path.stat().st_size} байт)")
-                            return file_path
-                except Exception:
-                    pass
+        found = self._downloads
+        # Обычно наблюдатель уже запущен в _reset_download_events - до клика по кнопке
+        self._start_download_observer()
+
+        # Файл мог появиться ещё до запуска наблюдателя
+        for name, stat in self._scan_downloads()[1].items():
+            if (name, stat) not in self._files_before:
+                found.put((self.downloads_dir / name, False))
+
+        # Файл, который уже появился, но ещё дописывается
+        pending: Optional[Path] = None
+        start_time = time.monotonic()
+        while True:
+            remaining = timeout - (time.monotonic() - start_time)
+            if remaining <= 0:
+                break
+            try:
+                # Недописанный файл перепроверяем раз в секунду на случай, если
+                # событие о завершении не придёт; иначе просто спим до события
+                file_path, completed = found.get(timeout=min(remaining, 1 if pending else 5))
+            except queue.Empty:
+                if pending is None:
+                    # Каждые 5 секунд без событий показываем прогресс
+                    elapsed = int(time.monotonic() - start_time)
+                    logger.info(f"   Ожидание... ({elapsed}/{timeout} сек)")
+                    continue
+                file_path, completed = pending, False
 
-            for file_path in self.downloads_dir.glob("*.xls"):
+            if completed:
+                # Браузер переименовал .crdownload в отчёт или сообщил о завершении
+                # через CDP - достаточно одного stat без сканирования папки
                 try:
-                    if file_path.stat().st_size > 0:
-                        if time.time() - file_path.stat().st_mtime > 2:
-                            logger.info(f"   ✓ Найден новый файл: {file_path.name} ({file_path.stat().st_size} байт)")
-                            return file_path
-                except Exception:
-                    pass
-
-            time.sleep(1)
+                    size = file_path.stat().st_size
+                except OSError:
+                    size = 0
+                if size > 0:
+                    logger.info(f"   ✓ Найден новый файл: {file_path.name} ({size} байт)")
+                    return file_path
+
+            # Один проход scandir даёт и наличие .crdownload, и размеры файлов
+            # (на Windows размер приходит вместе с записью каталога без отдельного stat)
+            crdownload, files = self._scan_downloads()
+            stat = files.get(file_path.name)
+            if stat is None or (file_path.name, stat) in self._files_before:
+                # Файл удалён или это старый отчёт, который не изменился
+                if pending == file_path:
+                    pending = None
+                continue
+            size = stat[0]
+            # Пока в папке есть .crdownload, скачивание ещё идёт (если CDP не сообщил иное)
+            if size > 0 and (self._download_done.is_set() or not crdownload):
+                logger.info(f"   ✓ Найден новый файл: {file_path.name} ({size} байт)")
+                return file_path
+            # Переименование .crdownload → отчёт разбудит ожидание сразу, без опроса папки
+            pending = file_path
 
         logger.error(f"   ❌ Таймаут ожидания скачивания файла ({timeout} сек)")
         return None
 
+    def _scan_downloads(self) -> Tuple[bool, Dict[str, Tuple[int, int]]]:
+        """Сканирует папку загрузок за один проход (stat из записи каталога scandir).
+
+        Returns:
+            Кортеж (есть ли незавершённые .crdownload, (размер, mtime_ns) файлов отчётов по имени)
+        """
+        crdownload = False
+        files: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.downloads_dir) as entries:
+                for entry in entries:
+                    name = entry.name.lower()
+                    if name.endswith(".crdownload"):
+                        crdownload = True
+                    elif name.endswith(REPORT_SUFFIXES):
+                        try:
+                            stat = entry.stat()
+                            files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                        except OSError:
+                            pass
+        except OSError as e:
+            logger.debug(f"   Не удалось прочитать папку загрузок: {e}")
+        return crdownload, files
+
     def _process_downloaded_file(
         self, file_path: Path, cabinet_name: str, date_str: str
     ) -> Optional[Path]:
@@ -1077,19 +1842,17 @@ class BrowserAgent:
         try:
             # Новое имя файла - используем имя кабинета как есть
             new_name = f"{cabinet_name} {date_str}.xlsx"
-            new_path = self.downloads_dir / new_name
+            new_path = self.output_dir / new_name
 
             logger.info(f"   Исходный файл: {file_path.name}")
             logger.info(f"   Новое имя: {new_name}")
 
-            # Если файл с таким именем уже существует, удаляем его
-            if new_path.exists() and file_path != new_path:
-                logger.warning(f"   ⚠ Файл {new_name} уже существует, будет перезаписан")
-                new_path.unlink()
-
-            # Переименование файла
+            # Переименование файла: os.replace атомарно заменяет существующий файл
+            # (Path.rename на Windows в этом случае падает с FileExistsError)
             if file_path != new_path:
-                file_path.rename(new_path)
+                if new_path.exists():
+                    logger.warning(f"   ⚠ Файл {new_name} уже существует, будет перезаписан")
+                os.replace(file_path, new_path)
                 logger.info(f"   ✓ Файл переименован: {file_path.name} → {new_name}")
 
             # Замена первой строки
@@ -1107,71 +1870,85 @@ class BrowserAgent:
             logger.exception("Детали ошибки:")
             return None
 
+    def _load_template_row(self) -> List[str]:
+        """Читает заголовки из первой строки файла-примера (example_first_stroke.XLSX).
+
+        Файл открывается в режиме read_only и читается только первая строка,
+        результат кэшируется на процесс. Если файла нет или строка пустая, используются CORRECT_HEADERS.
+
+        Returns:
+            Список заголовков
+        """
+        template_path = self.example_first_stroke_path
+        # Один stat и для проверки наличия файла, и для ключа кэша
+        try:
+            mtime_ns = template_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            logger.warning(f"⚠ Файл-пример не найден: {template_path}, используются заголовки по умолчанию")
+            return list(CORRECT_HEADERS)
+
+        # Параллельные воркеры создают свои BrowserAgent - читаем файл один раз на процесс
+        headers = _read_template_row(str(template_path), mtime_ns)
+        return list(headers) or list(CORRECT_HEADERS)
+
     def _replace_first_row(self, file_path: Path) -> None:
-        """Удаление первой строки и замена заголовков на жёстко заданные значения.
+        """Удаление первой строки и замена заголовков на значения из файла-примера.
 
-        Алгоритм:
+        Алгоритм (выполняется правкой XML листа, см. replace_header_row):
         1. Разъединяем объединённые ячейки в первой строке
         2. Удаляем первую строку (неполные заголовки)
-        3. Заменяем новую первую строку (бывшую вторую) на жёстко заданные заголовки
+        3. Заменяем новую первую строку (бывшую вторую) на первую строку example_first_stroke.XLSX
 
         Args:
             file_path: Путь к файлу
         """
         try:
-            # Жёстко заданные заголовки (A-P столбцы)
-            headers = [
-                "Бренд",           # A
-                "Предмет",         # B
-                "Сезон",           # C
-                "Коллекция",       # D
-                "Наименование",    # E
-                "Артикул поставщика",  # F
-                "Номенклатура",    # G
-                "Баркод",          # H
-                "Размер",          # I
-                "Контракт",        # J
-                "Склад",           # K
-                "Заказано шт",     # L
-                "Заказано себестоимость",  # M
-                "Выкупили шт",     # N
-                "Выкупили руб",    # O
-                "Текущий остаток"  # P
-            ]
+            headers = self._template_row
+
+            # Правим только XML листа: объединения первой строки убираются, строка 1
+            # удаляется, а ссылки строк сдвигаются вверх текстом - без поячеечного
+            # сдвига всего листа, который делает openpyxl в delete_rows
+            logger.debug("Удаление первой строки и замена заголовков...")
+            _, new_first_row = replace_header_row(file_path, headers)
+            if new_first_row != headers:
+                raise Exception(f"Заголовки не записаны: {new_first_row}")
 
-            # Загружаем файл для обработки
-            wb = load_workbook(file_path)
-            ws = wb.active
-
-            # КРИТИЧНО: Шаг 1: Разъединяем все объединённые ячейки в первой строке
-            # (WB выгружает файлы с объединёнными ячейками в заголовках)
-            logger.debug("Разъединение объединённых ячеек в первой строке...")
-            merged_ranges = list(ws.merged_cells.ranges)
-            for merged_range in merged_ranges:
-                # Проверяем, относится ли объединение к первой строке
-                if merged_range.min_row == 1 and merged_range.max_row == 1:
-                    logger.debug(f"  Разъединяем: {merged_range}")
-                    ws.unmerge_cells(str(merged_range))
-
-            # Шаг 2: Удаляем первую строку (неполные заголовки)
-            logger.debug("Удаление первой строки...")
-            ws.delete_rows(1)
-
-            # Шаг 3: Заменяем новую первую строку (бывшую вторую) на жёстко заданные заголовки
-            logger.debug("Замена заголовков на жёстко заданные значения...")
-            for col_idx, header in enumerate(headers, start=1):
-                ws.cell(row=1, column=col_idx).value = header
-
-            # Сохраняем изменения
-            wb.save(file_path)
-            wb.close()
-            logger.success("✓ Первая строка удалена, заголовки заменены на жёстко заданные значения")
+            logger.success("✓ Первая строка удалена, заголовки заменены на строку из файла-примера")
 
         except Exception as e:
             logger.error(f"Ошибка при замене первой строки: {e}")
             logger.exception("Детали ошибки:")
             raise
 
+    def _backup_path(self, cabinet_name: str, date_str: str) -> Path:
+        """Путь резервной копии отчёта: data/<дата>/<кабинет>_<дата>.xlsx."""
+        return self.data_dir / date_str / f"{cabinet_name.lower()}_{date_str}.xlsx"
+
+    def _is_already_processed(self, cabinet_name: str, date_str: str) -> bool:
+        """Проверяет, есть ли уже обработанный отчёт кабинета за дату.
+
+        Резервная копия создаётся только после успешной замены заголовков, поэтому
+        непустая копия с заголовками из файла-примера означает готовый отчёт.
+
+        Args:
+            cabinet_name: Название кабинета
+            date_str: Дата в формате DD.MM.YYYY
+
+        Returns:
+            True, если отчёт можно не скачивать повторно
+        """
+        backup_path = self._backup_path(cabinet_name, date_str)
+        try:
+            if backup_path.stat().st_size == 0:
+                return False
+            # Читается только первая строка листа
+            return not needs_fix(backup_path, self._template_row)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.debug(f"   Не удалось проверить {backup_path.name}: {e}")
+            return False
+
     def _create_backup(self, file_path: Path, cabinet_name: str, date_str: str) -> Optional[Path]:
         """Создание резервной копии файла в папке data.
 
@@ -1185,15 +1962,27 @@ class BrowserAgent:
         """
         try:
             # Создаём папку с датой
-            date_folder = self.data_dir / date_str
-            date_folder.mkdir(parents=True, exist_ok=True)
-
-            # Новое имя файла для резервной копии
-            backup_name = f"{cabinet_name.lower()}_{date_str}.xlsx"
-            backup_path = date_folder / backup_name
-
-            # Копируем файл
-            shutil.copy2(file_path, backup_path)
+            backup_path = self._backup_path(cabinet_name, date_str)
+            backup_path.parent.mkdir(parents=True, exist_ok=True)
+            backup_name = backup_path.name
+
+            # Жёсткая ссылка вместо копирования: без записи данных на диск.
+            # Файлы отчётов не правятся на месте (только через временный файл
+            # и замену), поэтому общие данные у двух имён безопасны
+            if backup_path.exists() and os.path.samefile(file_path, backup_path):
+                logger.success(f"✓ Резервная копия уже актуальна: {backup_path}")
+                return backup_path
+
+            # Ссылку создаём под временным именем и атомарно заменяем старую копию:
+            # при сбое прежняя резервная копия не теряется
+            tmp_path = backup_path.with_name(f"~{backup_name}.tmp")
+            tmp_path.unlink(missing_ok=True)
+            try:
+                os.link(file_path, tmp_path)
+            except OSError:
+                # Другой диск или файловая система без жёстких ссылок - копируем
+                shutil.copy2(file_path, tmp_path)
+            os.replace(tmp_path, backup_path)
             logger.success(f"✓ Резервная копия создана: {backup_path}")
 
             return backup_path
@@ -1203,6 +1992,61 @@ class BrowserAgent:
             logger.exception("Детали ошибки:")
             return None
 
+    @property
+    def _cookies_file(self) -> Path:
+        """Файл с cookies последней успешной сессии WB.
+
+        Лежит в папке профиля, а не в data/: папку с отчётами копируют и пересылают,
+        а в файле - cookies сессии кабинетов, включая httpOnly.
+        """
+        return self.profile_dir / "wb_cookies.json"
+
+    def _save_cookies(self) -> None:
+        """Сохраняет cookies всех доменов (WB использует несколько поддоменов) после входа."""
+        try:
+            cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+            # Файл доступен только владельцу и подменяется атомарно через временный
+            tmp_path = self._cookies_file.with_name(f"~{self._cookies_file.name}.tmp")
+            tmp_path.unlink(missing_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cookies, f, ensure_ascii=False)
+            os.replace(tmp_path, self._cookies_file)
+            # Файл прежних версий с cookies в открытом виде в data/ больше не нужен
+            (self.data_dir / "cookies.json").unlink(missing_ok=True)
+            logger.debug(f"Cookies сохранены: {len(cookies)} шт.")
+        except (WebDriverException, OSError, KeyError) as e:
+            logger.warning(f"⚠ Не удалось сохранить cookies: {e}")
+
+    def _restore_cookies(self) -> bool:
+        """Загружает в браузер cookies прошлой сессии, если им не больше COOKIES_MAX_AGE_DAYS дней.
+
+        Returns:
+            True, если cookies загружены
+        """
+        try:
+            age = time.time() - self._cookies_file.stat().st_mtime
+        except OSError:
+            return False
+        if age > self.COOKIES_MAX_AGE_DAYS * 86400:
+            logger.info("Сохранённые cookies устарели, нужна авторизация")
+            return False
+
+        try:
+            cookies = json.loads(self._cookies_file.read_text(encoding="utf-8"))
+            # Network.setCookies принимает только поля CookieParam; у сессионных cookies
+            # expires=-1 - его не передаём, иначе cookie сразу считается истёкшим
+            params = [
+                {k: v for k, v in c.items() if k in self.COOKIE_PARAM_KEYS and not (k == "expires" and c.get("session"))}
+                for c in cookies
+            ]
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+            logger.info(f"✓ Загружены сохранённые cookies: {len(params)} шт.")
+            return True
+        except (WebDriverException, OSError, ValueError) as e:
+            logger.warning(f"⚠ Не удалось загрузить cookies: {e}")
+            return False
+
     def _detect_current_page_state(self) -> str:
         """Определяет на какой странице мы сейчас находимся.
         
@@ -1216,32 +2060,20 @@ class BrowserAgent:
             logger.debug(f"Текущий URL: {current_url}")
             
             # Проверка 1: Страница авторизации
-            if "seller-auth.wildberries.ru" in current_url:
+            if _is_auth_url(current_url):
                 logger.debug("→ Обнаружена страница авторизации")
                 return "auth_required"
             
-            # Проверка 2: Страница отчётов - ищем характерные элементы
-            try:
-                # Ищем любой из характерных элементов страницы отчётов
-                self.driver.find_element(By.ID, "suppliers-search")
-                logger.debug("→ Обнаружена страница отчётов (поле поиска)")
-                return "reports_page"
-            except:
-                pass
-            
-            try:
-                self.driver.find_element(By.CSS_SELECTOR, 'button.Date-input__icon-button__WnbzIWQzsq')
-                logger.debug("→ Обнаружена страница отчётов (кнопка календаря)")
+            # Проверка 2: Страница отчётов - поле поиска или кнопка календаря.
+            # Один дешёвый селектор (id и класс) - один запрос к chromedriver вместо двух
+            if self.driver.find_elements(By.CSS_SELECTOR, self.REPORTS_PAGE_CSS):
+                logger.debug("→ Обнаружена страница отчётов (поле поиска / кнопка календаря)")
                 return "reports_page"
-            except:
-                pass
             
-            try:
-                self.driver.find_element(By.XPATH, "//span[text()='Продажи']")
+            # find_elements вместо find_element: пустой список без исключения
+            if self.driver.find_elements(By.XPATH, self.SALES_TITLE_XPATH):
                 logger.debug("→ Обнаружена страница отчётов (заголовок)")
                 return "reports_page"
-            except:
-                pass
             
             # Если ничего не нашли
             logger.debug("→ Страница не распознана")
@@ -1251,19 +2083,309 @@ class BrowserAgent:
             logger.error(f"Ошибка при определении состояния страницы: {e}")
             return "unknown"
 
+    def _wait_for_known_page_state(self, timeout: float) -> str:
+        """Опрашивает состояние страницы, пока оно не станет известным.
+
+        Интервал опроса растёт с 0.5 до 2 секунд.
+
+        Args:
+            timeout: Максимальное время ожидания в секундах
+
+        Returns:
+            Состояние страницы (см. _detect_current_page_state)
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.5
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return "unknown"
+            time.sleep(min(delay, remaining))
+            state = self._detect_current_page_state()
+            if state != "unknown":
+                return state
+            delay = min(delay * 1.5, 2.0)
+
+    def _process_cabinets(self, cabinets: List[Dict[str, str]], target_date: Optional[date] = None) -> None:
+        """Обрабатывает кабинеты по очереди в текущем браузере (страница отчётов уже открыта).
+
+        Args:
+            cabinets: Список кабинетов для обработки
+            target_date: Дата для скачивания отчётов
+        """
+        # Раскрытие меню выбора кабинетов на главной странице
+        logger.info("Раскрытие меню выбора кабинетов на главной странице...")
+        try:
+            # Ищем кнопку с именем пользователя/кабинета для раскрытия меню
+            profile_button = WebDriverWait(self.driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, self.PROFILE_BUTTON_CSS))
+            )
+            # Появление поля поиска ждёт process_cabinet - пауз после клика не нужно
+            profile_button.click()
+            logger.success("✓ Меню выбора кабинетов раскрыто на главной странице")
+        except TimeoutException:
+            logger.warning("⚠ Кнопка раскрытия меню не найдена, возможно меню уже раскрыто или у пользователя один кабинет")
+        except Exception as e:
+            logger.warning(f"⚠ Ошибка при раскрытии меню: {e}, продолжаем работу...")
+
+        # Обработка каждого кабинета
+        total_cabinets = len(cabinets)
+        logger.info("")
+        logger.info("=" * 70)
+        logger.info(f"📊 НАЧИНАЕМ ОБРАБОТКУ {total_cabinets} КАБИНЕТОВ")
+        logger.info("=" * 70)
+
+        # Обработка файлов - в одном фоновом потоке, по одному отчёту за раз
+        results: List[Tuple[Dict[str, str], Future]] = []
+        with ThreadPoolExecutor(max_workers=1) as postprocessor:
+            for idx, cabinet in enumerate(cabinets, 1):
+                try:
+                    logger.info("")
+                    logger.info("")
+                    logger.info("╔" + "═" * 68 + "╗")
+                    logger.info(f"║  КАБИНЕТ {idx}/{total_cabinets}: {cabinet['name'].upper()} (ID: {cabinet['id']})")
+                    logger.info("╚" + "═" * 68 + "╝")
+
+                    # С SKIP_PROCESSED=true повторный запуск за ту же дату не скачивает уже готовые отчёты
+                    if self.settings.skip_processed and self._is_already_processed(
+                        cabinet["name"], self._report_date_str(target_date)
+                    ):
+                        logger.warning(
+                            f"⚠ Отчёт кабинета {cabinet['name']} за эту дату уже есть, скачивание пропущено "
+                            f"(SKIP_PROCESSED=true; данные WB могли обновиться)"
+                        )
+                        continue
+
+                    # Если сессия браузера потеряна - перезапускаем его и открываем отчёты
+                    if self.ensure_browser():
+                        self.driver.get(self.settings.wildberries_start_url)
+                        self._wait_for_page_ready()
+
+                    # Проверка состояния перед обработкой кабинета
+                    logger.info("Проверка состояния страницы...")
+                    page_state = self._detect_current_page_state()
+
+                    if page_state == "auth_required":
+                        logger.warning("⚠ Требуется повторная авторизация!")
+                        self._perform_authorization()
+                        # Переход обратно на страницу отчётов
+                        logger.info("Переход на страницу отчётов...")
+                        self.driver.get(self.settings.wildberries_start_url)
+                        self._wait_for_page_ready()
+                    elif page_state == "unknown":
+                        logger.warning("⚠ Неизвестная страница, переход на страницу отчётов...")
+                        self.driver.get(self.settings.wildberries_start_url)
+                        self._wait_for_page_ready()
+                    else:
+                        logger.info("✓ Страница отчётов доступна")
+
+                    # Скачивание отчёта в браузере; переименование и правка заголовков
+                    # идут в фоне, пока браузер готовит следующий кабинет
+                    downloaded_file, date_str = self._download_report(cabinet, target_date)
+                    if downloaded_file:
+                        self._postprocess_future = postprocessor.submit(
+                            self._postprocess_report, downloaded_file, cabinet["name"], date_str
+                        )
+                        results.append((cabinet, self._postprocess_future))
+                    else:
+                        logger.error(f"❌ Ошибка при обработке кабинета {cabinet['name']}")
+
+                    # Возврат на стартовую страницу для следующего кабинета
+                    if idx < total_cabinets:  # Не возвращаемся после последнего кабинета
+                        logger.info("")
+                        logger.info("⏭ Переход к следующему кабинету...")
+                        # Браузер тот же - убираем следы предыдущего кабинета вместо перезапуска
+                        self._reset_browser_state()
+                        logger.info("   Возврат на стартовую страницу...")
+                        self.driver.get(self.settings.wildberries_start_url)
+
+                        # Ждём полной загрузки страницы
+                        logger.info("   Ожидание загрузки страницы...")
+                        self._wait_for_page_ready()
+
+                        # КРИТИЧНО: Заново раскрываем меню для следующего кабинета
+                        logger.info("   Раскрытие меню для следующего кабинета...")
+                        try:
+                            profile_button = WebDriverWait(self.driver, 10).until(
+                                EC.element_to_be_clickable((By.CSS_SELECTOR, self.PROFILE_BUTTON_CSS))
+                            )
+                            profile_button.click()
+                            logger.info("   ✓ Меню раскрыто")
+                        except TimeoutException:
+                            logger.warning("   ⚠ Кнопка раскрытия меню не найдена")
+                        except Exception as e:
+                            logger.warning(f"   ⚠ Ошибка при раскрытии меню: {e}")
+
+                except Exception as e:
+                    logger.error(f"❌ Критическая ошибка при обработке кабинета {cabinet['name']}: {e}")
+                    logger.exception("Детали ошибки:")
+                    continue
+
+        self._postprocess_future = None
+
+        for cabinet, future in results:
+            result = future.result()
+            if result:
+                logger.success(f"✅ Кабинет {cabinet['name']} обработан успешно")
+                logger.info(f"   Файл сохранён: {result.name}")
+            else:
+                logger.error(f"❌ Ошибка при обработке кабинета {cabinet['name']}")
+
+    def _reset_browser_state(self) -> None:
+        """Готовит открытый браузер к следующему кабинету без перезапуска.
+
+        Закрывает лишние вкладки (например, открытые при скачивании) и очищает
+        поле поиска кабинетов, если оно осталось на странице.
+        """
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+            self.driver.execute_script(
+                "const input = document.getElementById(arguments[0]); if (input) input.value = '';",
+                self.SUPPLIERS_SEARCH_ID,
+            )
+        except WebDriverException as e:
+            logger.debug(f"   Не удалось сбросить состояние браузера: {e}")
+
+    def _copy_profile(self, target_dir: Path) -> None:
+        """Копирует профиль браузера (с авторизацией) для дополнительного экземпляра.
+
+        Два браузера не могут работать с одной папкой профиля, поэтому каждый
+        параллельный браузер получает свою копию. Кэши и файлы блокировки не копируются.
+
+        Args:
+            target_dir: Папка копии профиля
+        """
+        shutil.copytree(
+            self.profile_dir,
+            target_dir,
+            ignore=shutil.ignore_patterns("*Cache*", "Singleton*", "lockfile"),
+            dirs_exist_ok=True,
+        )
+
+    def _run_worker(self, cabinets: List[Dict[str, str]], target_date: Optional[date] = None) -> None:
+        """Обрабатывает часть кабинетов в отдельном браузере (страница отчётов уже открыта).
+
+        Args:
+            cabinets: Кабинеты, назначенные этому браузеру
+            target_date: Дата для скачивания отчётов
+        """
+        names = ", ".join(cabinet["name"] for cabinet in cabinets)
+        if self._detect_current_page_state() != "reports_page":
+            # Вводить SMS-код в нескольких браузерах сразу нельзя - авторизация только в основном
+            logger.error(f"❌ Браузер {self.profile_dir.name} не попал на страницу отчётов, пропущены: {names}")
+            return
+        self._process_cabinets(cabinets, target_date)
+
+    def _process_cabinets_parallel(self, target_date: Optional[date] = None) -> None:
+        """Обрабатывает кабинеты в нескольких браузерах одновременно.
+
+        Каждый браузер работает со своей копией профиля и своей папкой скачивания,
+        готовые файлы складываются в общую папку downloads.
+
+        Args:
+            target_date: Дата для скачивания отчётов
+        """
+        workers_count = self._parallel_workers_count()
+        logger.info(f"📊 Параллельная обработка: {workers_count} браузера(ов)")
+
+        workers: List[BrowserAgent] = [
+            BrowserAgent(
+                self.settings,
+                profile_dir=self.profile_dir.with_name(f"{self.profile_dir.name}_worker{i}"),
+                downloads_dir=self.output_dir / f"_worker{i}",
+            )
+            for i in range(1, workers_count + 1)
+        ]
+        # Если основной браузер пришлось перезапустить с окном, воркеры тоже работают с окном
+        for worker in workers:
+            worker._headless = self._headless
+        try:
+            # Первый браузер запускаем отдельно: он скачивает и патчит ChromeDriver,
+            # остальные стартуют одновременно с уже готовым драйвером из кэша
+            started = [workers[0]] if self._try_launch_worker(workers[0]) else []
+
+            # Работа в браузерах - ожидание сети и скачивания, поэтому хватает потоков
+            with ThreadPoolExecutor(max_workers=workers_count) as executor:
+                launches = [executor.submit(self._try_launch_worker, worker) for worker in workers[1:]]
+                started += [worker for worker, launch in zip(workers[1:], launches) if launch.result()]
+
+                if not started:
+                    # Ни один браузер не запустился - кабинеты обрабатывает основной браузер
+                    logger.warning("⚠ Параллельные браузеры не запустились, обрабатываем кабинеты в основном браузере")
+                    self.ensure_browser()
+                    self.driver.get(self.settings.wildberries_start_url)
+                    self._wait_for_page_ready()
+                    self._run_worker(self.CABINETS, target_date)
+                    return
+                if len(started) < workers_count:
+                    logger.warning(f"⚠ Запущено браузеров: {len(started)} из {workers_count}, кабинеты распределены между ними")
+
+                # Кабинеты раскладываем по запущенным браузерам по кругу
+                chunks = [self.CABINETS[i::len(started)] for i in range(len(started))]
+                futures = [
+                    executor.submit(worker._run_worker, chunk, target_date)
+                    for worker, chunk in zip(started, chunks)
+                ]
+                for future in futures:
+                    future.result()
+        finally:
+            for worker in workers:
+                worker.close_browser()
+
+    def _try_launch_worker(self, worker: "BrowserAgent") -> bool:
+        """Запускает параллельный браузер; ошибка запуска не останавливает остальные.
+
+        Args:
+            worker: Агент параллельного браузера
+
+        Returns:
+            True, если браузер запущен и открыл страницу WB
+        """
+        try:
+            self._launch_worker(worker)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Не удалось запустить браузер {worker.profile_dir.name}: {e}")
+            worker.close_browser()
+            return False
+
+    def _launch_worker(self, worker: "BrowserAgent") -> None:
+        """Готовит параллельный браузер: копия профиля, запуск, страница отчётов.
+
+        Args:
+            worker: Агент параллельного браузера
+        """
+        self._copy_profile(worker.profile_dir)
+        worker.start_browser()
+        worker.driver.get(self.settings.wildberries_start_url)
+        worker._wait_for_page_ready()
+
+    def _parallel_workers_count(self) -> int:
+        """Число параллельных браузеров: из настроек или по числу ядер (PARALLEL_BROWSERS=0).
+
+        Returns:
+            Число браузеров, не больше числа кабинетов
+        """
+        count = self.settings.parallel_browsers or max(1, (os.cpu_count() or 2) // 2)
+        return min(count, len(self.CABINETS))
+
     def execute_flow(self, target_date: Optional[date] = None) -> None:
         """Выполнение основного потока работы для всех кабинетов.
         
+        Браузер не закрывается по завершении: он переиспользуется следующими
+        вызовами и закрывается при выходе из контекста агента (with BrowserAgent(...)).
+
         Args:
             target_date: Дата для скачивания отчётов (если None, используется вчерашний день)
         """
         try:
-            # Запуск браузера
-            self.start_browser()
-            
-            # Ждём стабилизации браузера
-            logger.info("Ожидание стабилизации браузера...")
-            time.sleep(3)
+            # Запуск браузера (или переиспользование уже запущенного);
+            # start_browser сам дожидается готовности браузера
+            self.ensure_browser()
             
             # Открываем страницу Wildberries
             logger.info(f"Открытие страницы {self.WILDBERRIES_REPORTS_URL}...")
@@ -1271,13 +2393,32 @@ class BrowserAgent:
             
             # Ждём загрузки страницы
             logger.info("Ожидание загрузки страницы...")
-            time.sleep(self.settings.delay_page_load)
+            self._wait_for_page_ready()
+
+            # Состояние страницы определяется заново только после перехода на другую страницу
+            page_state: Optional[str] = self._detect_current_page_state()
+
+            # WB может не показать отчёты браузеру без окна - перезапускаем с окном
+            if self._headless and page_state != "reports_page":
+                logger.warning("⚠ В режиме без окна страница отчётов недоступна, перезапуск браузера с окном...")
+                self.close_browser()
+                self._headless = False
+                self.ensure_browser()
+                self.driver.get(self.WILDBERRIES_REPORTS_URL)
+                self._wait_for_page_ready()
+                page_state = self._detect_current_page_state()
+
+            # Сессия в профиле истекла - пробуем cookies с прошлого успешного запуска
+            if page_state == "auth_required" and self._restore_cookies():
+                self.driver.get(self.WILDBERRIES_REPORTS_URL)
+                self._wait_for_page_ready()
+                page_state = None
             
             # === УМНЫЙ ЦИКЛ ПРОВЕРКИ СОСТОЯНИЯ ===
-            # Проверяем состояние страницы каждые 30 секунд и выполняем нужные действия
+            # Проверяем состояние страницы (до 30 секунд на цикл) и выполняем нужные действия
             logger.info("=" * 60)
             logger.info("ЗАПУСК УМНОГО МОНИТОРИНГА СОСТОЯНИЯ")
-            logger.info("Скрипт будет проверять состояние страницы каждые 30 секунд")
+            logger.info("Скрипт будет проверять состояние страницы (не дольше 30 секунд на цикл)")
             logger.info("=" * 60)
             
             max_wait_cycles = 10  # Максимум 10 циклов по 30 секунд = 5 минут ожидания
@@ -1288,8 +2429,9 @@ class BrowserAgent:
                 current_cycle += 1
                 logger.info(f"[Цикл {current_cycle}/{max_wait_cycles}] Проверка состояния страницы...")
                 
-                # Определяем состояние
-                page_state = self._detect_current_page_state()
+                # Определяем состояние (если оно не известно с прошлого шага)
+                if page_state is None:
+                    page_state = self._detect_current_page_state()
                 
                 if page_state == "auth_required":
                     logger.info("=" * 60)
@@ -1298,8 +2440,8 @@ class BrowserAgent:
                     logger.info("=" * 60)
                     try:
                         self._perform_authorization()
-                        # После авторизации ждём загрузки следующей страницы
-                        time.sleep(5)
+                        # После авторизации ждём элементов страницы отчётов, а не фиксированные 5 секунд
+                        self._wait_for_reports_page()
                         # Проверяем, попали ли на страницу отчётов
                         if self._detect_current_page_state() == "reports_page":
                             logger.success("✓ АВТОРИЗАЦИЯ УСПЕШНА! Переход на страницу отчётов")
@@ -1310,6 +2452,7 @@ class BrowserAgent:
                     except Exception as e:
                         logger.error(f"Ошибка при авторизации: {e}")
                         logger.info("Продолжаем мониторинг...")
+                    page_state = None
                     
                 elif page_state == "reports_page":
                     logger.success("=" * 60)
@@ -1320,106 +2463,28 @@ class BrowserAgent:
                     break
                     
                 else:
-                    logger.warning(f"⚠ Страница не распознана, ожидание 30 секунд...")
+                    logger.warning("⚠ Страница не распознана, ожидание до 30 секунд...")
                     logger.info(f"Текущий URL: {self.driver.current_url}")
-                    time.sleep(30)
+                    # Выходим из ожидания сразу, как только страница распознана
+                    # (например, пользователь вошёл вручную), а не через полные 30 секунд
+                    page_state = self._wait_for_known_page_state(30)
+                    if page_state == "unknown":
+                        page_state = None
             
-            if not authorized:
+            if authorized:
+                self._save_cookies()
+            else:
                 logger.error("✗ НЕ УДАЛОСЬ АВТОРИЗОВАТЬСЯ ИЛИ ПОПАСТЬ НА СТРАНИЦУ ОТЧЁТОВ")
                 logger.error(f"Истекло время ожидания ({max_wait_cycles * 30} секунд)")
                 raise Exception("Не удалось авторизоваться")
             
             # === РАБОТА С КАБИНЕТАМИ (запускается только если authorized=True) ===
-            
-            # Раскрытие меню выбора кабинетов на главной странице
-            logger.info("Раскрытие меню выбора кабинетов на главной странице...")
-            try:
-                # Ищем кнопку с именем пользователя/кабинета для раскрытия меню
-                profile_button = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-testid="desktop-profile-select-button-chips-component"]'))
-                )
-                time.sleep(self.settings.delay_before_click)
-                profile_button.click()
-                time.sleep(self.settings.delay_after_click)
-                logger.success("✓ Меню выбора кабинетов раскрыто на главной странице")
-            except TimeoutException:
-                logger.warning("⚠ Кнопка раскрытия меню не найдена, возможно меню уже раскрыто или у пользователя один кабинет")
-            except Exception as e:
-                logger.warning(f"⚠ Ошибка при раскрытии меню: {e}, продолжаем работу...")
-
-            # Обработка каждого кабинета
-            total_cabinets = len(self.CABINETS)
-            logger.info("")
-            logger.info("=" * 70)
-            logger.info(f"📊 НАЧИНАЕМ ОБРАБОТКУ {total_cabinets} КАБИНЕТОВ")
-            logger.info("=" * 70)
-            
-            for idx, cabinet in enumerate(self.CABINETS, 1):
-                try:
-                    logger.info("")
-                    logger.info("")
-                    logger.info("╔" + "═" * 68 + "╗")
-                    logger.info(f"║  КАБИНЕТ {idx}/{total_cabinets}: {cabinet['name'].upper()} (ID: {cabinet['id']})")
-                    logger.info("╚" + "═" * 68 + "╝")
-                    
-                    # Проверка состояния перед обработкой кабинета
-                    logger.info("Проверка состояния страницы...")
-                    page_state = self._detect_current_page_state()
-                    
-                    if page_state == "auth_required":
-                        logger.warning("⚠ Требуется повторная авторизация!")
-                        self._perform_authorization()
-                        time.sleep(5)
-                        # Переход обратно на страницу отчётов
-                        logger.info("Переход на страницу отчётов...")
-                        self.driver.get(self.settings.wildberries_start_url)
-                        time.sleep(self.settings.delay_page_load)
-                    elif page_state == "unknown":
-                        logger.warning("⚠ Неизвестная страница, переход на страницу отчётов...")
-                        self.driver.get(self.settings.wildberries_start_url)
-                        time.sleep(self.settings.delay_page_load)
-                    else:
-                        logger.info("✓ Страница отчётов доступна")
-                    
-                    # Обработка кабинета
-                    result = self.process_cabinet(cabinet, target_date=target_date)
-
-                    if result:
-                        logger.success(f"✅ Кабинет {cabinet['name']} обработан успешно")
-                        logger.info(f"   Файл сохранён: {result.name}")
-                    else:
-                        logger.error(f"❌ Ошибка при обработке кабинета {cabinet['name']}")
-
-                    # Возврат на стартовую страницу для следующего кабинета
-                    if cabinet != self.CABINETS[-1]:  # Не возвращаемся после последнего кабинета
-                        logger.info("")
-                        logger.info("⏭ Переход к следующему кабинету...")
-                        logger.info("   Возврат на стартовую страницу...")
-                        self.driver.get(self.settings.wildberries_start_url)
-                        
-                        # Ждём полной загрузки страницы
-                        logger.info("   Ожидание загрузки страницы...")
-                        time.sleep(self.settings.delay_page_load)
-                        
-                        # КРИТИЧНО: Заново раскрываем меню для следующего кабинета
-                        logger.info("   Раскрытие меню для следующего кабинета...")
-                        try:
-                            profile_button = WebDriverWait(self.driver, 10).until(
-                                EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-testid="desktop-profile-select-button-chips-component"]'))
-                            )
-                            time.sleep(self.settings.delay_before_click)
-                            profile_button.click()
-                            time.sleep(self.settings.delay_after_click)
-                            logger.info("   ✓ Меню раскрыто")
-                        except TimeoutException:
-                            logger.warning("   ⚠ Кнопка раскрытия меню не найдена")
-                        except Exception as e:
-                            logger.warning(f"   ⚠ Ошибка при раскрытии меню: {e}")
-
-                except Exception as e:
-                    logger.error(f"❌ Критическая ошибка при обработке кабинета {cabinet['name']}: {e}")
-                    logger.exception("Детали ошибки:")
-                    continue
+            if self._parallel_workers_count() > 1:
+                # Текущий браузер закрываем: его профиль копируется для параллельных браузеров
+                self.close_browser()
+                self._process_cabinets_parallel(target_date)
+            else:
+                self._process_cabinets(self.CABINETS, target_date)
 
             logger.info("")
             logger.info("=" * 70)
@@ -1430,7 +2495,3 @@ class BrowserAgent:
             logger.error(f"Критическая ошибка в процессе выполнения: {e}")
             logger.exception("Детали ошибки:")
             raise
-
-        finally:
-            # Закрытие браузера
-            self.close_browser()
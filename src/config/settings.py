@@ -60,6 +60,7 @@ class Settings(BaseSettings):
     downloads_dir: str = Field(default="downloads", description="Папка для скачанных файлов")
     logs_dir: str = Field(default="logs", description="Папка для логов")
     data_dir: str = Field(default="data", description="Папка для обработанных данных")
+    drivers_dir: str = Field(default="drivers", description="Папка для кэша пропатченного ChromeDriver")
 
     # Путь к файлу с примером первой строки
     example_first_stroke_file: str = Field(
@@ -67,6 +68,28 @@ class Settings(BaseSettings):
         description="Путь к файлу с примером первой строки для замены",
     )
 
+    # Число браузеров для параллельной обработки кабинетов (1 - по очереди в одном браузере,
+    # 0 - автоматически: половина ядер процессора, но не больше числа кабинетов)
+    parallel_browsers: int = Field(
+        default=1,
+        ge=0,
+        description="Число одновременно работающих браузеров (у каждого своя копия профиля)",
+    )
+
+    # Не загружать картинки на страницах WB (ускоряет загрузку страниц).
+    # По умолчанию выключено: без картинок на странице входа может не показаться капча
+    disable_images: bool = Field(default=False, description="Отключить загрузку изображений в браузере")
+
+    # Работа без окна браузера (профиль должен быть авторизован заранее через manual_auth.py)
+    headless: bool = Field(default=False, description="Запускать браузер без окна (--headless=new)")
+
+    # Быстрый ввод: значение полей (ID кабинета, даты, телефон и коды входа) задаётся одним вызовом вместо send_keys
+    fast_mode: bool = Field(default=False, description="Заполнять поля через JavaScript одним вызовом")
+
+    # Не скачивать заново отчёты, уже обработанные за эту дату (есть копия в data/<дата>/).
+    # По умолчанию выключено: WB обновляет продажи в течение дня, повторный запуск скачивает свежие данные
+    skip_processed: bool = Field(default=False, description="Пропускать кабинеты с готовым отчётом за дату")
+
     # Таймауты ожидания элементов (в секундах)
     element_wait_timeout: int = Field(default=20, description="Таймаут ожидания элемента")
 
@@ -18,23 +18,25 @@ def kill_yandex_processes() -> int:
     Returns:
         Количество закрытых процессов
     """
-    killed_count = 0
-    processes_to_kill = ['browser.exe', 'YandexBrowser.exe']
+    # Имена в нижнем регистре - множество собирается один раз, а не для каждого процесса
+    processes_to_kill = {'browser.exe', 'yandexbrowser.exe'}
+    killed = []
     
-    for proc in psutil.process_iter(['pid', 'name']):
+    for proc in psutil.process_iter(['name']):
         try:
-            if proc.info['name'] and proc.info['name'].lower() in [p.lower() for p in processes_to_kill]:
-                logger.info(f"Закрытие процесса: {proc.info['name']} (PID: {proc.info['pid']})")
+            name = proc.info['name']
+            if name and name.lower() in processes_to_kill:
+                logger.info(f"Закрытие процесса: {name} (PID: {proc.pid})")
                 proc.kill()
-                killed_count += 1
+                killed.append(proc)
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             pass
     
+    killed_count = len(killed)
     if killed_count > 0:
         logger.info(f"✓ Закрыто процессов Yandex Browser: {killed_count}")
-        # Даём время процессам завершиться
-        import time
-        time.sleep(2)
+        # Ждём завершения процессов (не дольше 2 секунд) вместо фиксированной паузы
+        psutil.wait_procs(killed, timeout=2)
     else:
         logger.info("✓ Процессы Yandex Browser не найдены")
     
@@ -113,30 +115,37 @@ def main() -> int:
         parser.add_argument(
             '--date',
             type=str,
-            help='Дата для скачивания отчётов в формате DD.MM.YYYY (например: 10.12.2025). По умолчанию - вчерашний день',
+            nargs='+',
+            help=(
+                'Дата (или несколько дат через пробел) для скачивания отчётов в формате DD.MM.YYYY '
+                '(например: 10.12.2025 11.12.2025). По умолчанию - вчерашний день'
+            ),
             default=None
         )
         args = parser.parse_args()
         
-        # Обработка даты
-        target_date = None
+        # Обработка дат
+        target_dates = []
         if args.date:
-            try:
-                target_date = datetime.strptime(args.date, "%d.%m.%Y").date()
+            for date_arg in args.date:
+                try:
+                    target_date = datetime.strptime(date_arg, "%d.%m.%Y").date()
+                except ValueError:
+                    logger.error(f"❌ Неверный формат даты: {date_arg}. Используйте формат DD.MM.YYYY (например: 10.12.2025)")
+                    return 1
+                target_dates.append(target_date)
                 logger.info(f"✓ Указана дата для скачивания: {target_date.strftime('%d.%m.%Y')}")
-            except ValueError:
-                logger.error(f"❌ Неверный формат даты: {args.date}. Используйте формат DD.MM.YYYY (например: 10.12.2025)")
-                return 1
         else:
             # По умолчанию - вчерашний день
-            target_date = (datetime.now() - timedelta(days=1)).date()
-            logger.info(f"✓ Используется дата по умолчанию (вчера): {target_date.strftime('%d.%m.%Y')}")
-
-        # Создание агента
-        agent = BrowserAgent(settings)
-
-        # Выполнение основного потока
-        agent.execute_flow(target_date=target_date)
+            target_dates.append((datetime.now() - timedelta(days=1)).date())
+            logger.info(f"✓ Используется дата по умолчанию (вчера): {target_dates[0].strftime('%d.%m.%Y')}")
+
+        # Создание агента (браузер закрывается при выходе из блока with).
+        # Для всех дат используется один браузер: запуск и авторизация выполняются один раз
+        with BrowserAgent(settings) as agent:
+            # Выполнение основного потока
+            for target_date in target_dates:
+                agent.execute_flow(target_date=target_date)
 
         logger.success("=" * 60)
         logger.success("Работа завершена успешно")
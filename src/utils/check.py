@@ -0,0 +1,116 @@
+"""Проверка заголовков и объединённых ячеек в файле отчёта.
+
+Запуск: python -m src.utils.check [путь к файлу]
+"""
+import argparse
+import re
+import sys
+import zipfile
+from pathlib import Path
+from typing import List
+
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.xml import LXML
+
+from .xlsx_cache import close_all, load_cached
+from .xlsx_headers import SHEET_PATH
+
+DEFAULT_FILE = Path("data/11.12.2025/beautylab_11.12.2025.xlsx")
+
+# Буквы столбцов A-P считаем один раз
+COLS = tuple(chr(64 + i) for i in range(1, 17))
+
+# Объединения не ищем через openpyxl: теги <mergeCell ref="..."/> читаем напрямую из XML листа
+MERGE_CELL_RE = re.compile(rb'<mergeCell ref="([^"]+)"')
+
+
+def first_row_merges(file_path: Path) -> List[CellRange]:
+    """Возвращает объединения, начинающиеся в первой строке листа (например, A1:C1 или A1:A2).
+
+    Правило то же, что у xlsx_headers._patch_sheet, который такие объединения удаляет.
+
+    Args:
+        file_path: Путь к xlsx-файлу
+
+    Returns:
+        Список диапазонов объединённых ячеек
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        sheet_xml = archive.read(SHEET_PATH)
+    ranges = [CellRange(ref.decode()) for ref in MERGE_CELL_RE.findall(sheet_xml)]
+    return [cell_range for cell_range in ranges if cell_range.min_row == 1]
+
+
+def print_headers(file_path: Path) -> None:
+    """Печатает первую строку (заголовки) и первые 5 значений второй строки.
+
+    Args:
+        file_path: Путь к xlsx-файлу
+    """
+    # openpyxl сам использует lxml, если он установлен (в разы быстрее ElementTree)
+    if not LXML:
+        print("⚠️  lxml не установлен - openpyxl работает через медленный ElementTree (pip install lxml)")
+    # read_only: openpyxl читает XML листа потоково, без построения всей сетки ячеек и стилей
+    _, ws = load_cached(file_path)
+
+    # На листе может быть меньше двух строк - недостающие ячейки считаем пустыми (None)
+    rows = list(ws.iter_rows(min_row=1, max_row=2, max_col=16, values_only=True))
+    first_row, second_row = (
+        tuple(row) + (None,) * (len(COLS) - len(row)) for row in (rows + [(), ()])[:2]
+    )
+
+    print('Первая строка (заголовки):')
+    for col_letter, value in zip(COLS, first_row):
+        print(f'{col_letter}: {value}')
+
+    print('\nВторая строка (первые 5 значений - данные):')
+    for value in second_row[:5]:
+        print(f'{value}', end=', ')
+    print()
+
+
+def print_merged(file_path: Path) -> None:
+    """Печатает объединённые ячейки первой строки и значения её первых 5 ячеек.
+
+    Args:
+        file_path: Путь к xlsx-файлу
+    """
+    merged_ranges = first_row_merges(file_path)
+    # Значения первой строки - потоковым чтением одной строки (книга кэшируется)
+    _, ws = load_cached(file_path)
+    first_row = next(ws.iter_rows(min_row=1, max_row=1, max_col=5, values_only=True), ())
+    values = tuple(first_row) + (None,) * (5 - len(first_row))
+
+    print("Объединённые ячейки в первой строке:")
+    print(merged_ranges)
+
+    print("\nФормат первой строки (первые 5 ячеек):")
+    for col, value in zip(COLS[:5], values):
+        coordinate = f"{col}1"
+        merged = any(coordinate in merged_range for merged_range in merged_ranges)
+        print(f"  {col}: value={value}, merged={merged}")
+
+
+def main() -> int:
+    """Точка входа CLI."""
+    parser = argparse.ArgumentParser(description='Проверка заголовков и объединённых ячеек отчёта')
+    parser.add_argument('file', nargs='?', type=Path, default=DEFAULT_FILE, help='Путь к xlsx-файлу')
+    parser.add_argument('--headers', action='store_true', help='Только заголовки')
+    parser.add_argument('--merged', action='store_true', help='Только объединённые ячейки')
+    args = parser.parse_args()
+
+    show_all = not (args.headers or args.merged)
+    try:
+        if show_all or args.headers:
+            print_headers(args.file)
+        if show_all:
+            print()
+        if show_all or args.merged:
+            print_merged(args.file)
+    finally:
+        close_all()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Кэш книг xlsx, открытых только для чтения.
+
+Повторные проверки одного и того же файла в рамках процесса используют
+уже разобранную книгу. Ключ кэша - путь и время изменения файла, поэтому
+после перезаписи файла книга загружается заново.
+"""
+import functools
+from pathlib import Path
+from typing import List, Tuple
+
+from openpyxl import load_workbook
+from openpyxl.workbook.workbook import Workbook
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+
+# Все открытые книги (lru_cache не закрывает вытесненные записи сам)
+_opened: List[Workbook] = []
+
+
+@functools.lru_cache(maxsize=8)
+def _load(path_str: str, mtime_ns: int) -> Tuple[Workbook, ReadOnlyWorksheet]:
+    """Открывает книгу в режиме read_only.
+
+    Args:
+        path_str: Абсолютный путь к файлу
+        mtime_ns: Время изменения файла (часть ключа кэша)
+
+    Returns:
+        Кортеж (книга, активный лист)
+    """
+    wb = load_workbook(path_str, read_only=True, data_only=True, keep_links=False)
+    _opened.append(wb)
+    return wb, wb.active
+
+
+def load_cached(file_path: Path) -> Tuple[Workbook, ReadOnlyWorksheet]:
+    """Возвращает книгу и активный лист, открывая файл только при первом обращении.
+
+    Args:
+        file_path: Путь к xlsx-файлу
+
+    Returns:
+        Кортеж (книга, активный лист)
+    """
+    file_path = Path(file_path).resolve()
+    return _load(str(file_path), file_path.stat().st_mtime_ns)
+
+
+def close_all() -> None:
+    """Закрывает все книги из кэша и освобождает файлы."""
+    _load.cache_clear()
+    while _opened:
+        _opened.pop().close()
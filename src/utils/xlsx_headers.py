@@ -0,0 +1,501 @@
+"""Замена строки заголовков в xlsx-файле через прямое редактирование XML листа.
+
+Вместо полного цикла openpyxl (load_workbook → delete_rows → save), который
+пересобирает все листы, стили и общие строки, меняется только
+xl/worksheets/sheet1.xml. Остальные части архива копируются без изменений.
+"""
+import functools
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from lxml import etree
+
+# Правильные заголовки по столбцам A-P
+CORRECT_HEADERS = [
+    "Бренд",           # A
+    "Предмет",         # B
+    "Сезон",           # C
+    "Коллекция",       # D
+    "Наименование",    # E
+    "Артикул поставщика",  # F
+    "Номенклатура",    # G
+    "Баркод",          # H
+    "Размер",          # I
+    "Контракт",        # J
+    "Склад",           # K
+    "Заказано шт",     # L
+    "Заказано себестоимость",  # M
+    "Выкупили шт",     # N
+    "Выкупили руб",    # O
+    "Текущий остаток"  # P
+]
+
+# Буквы столбцов A-P (считаются один раз, а не в каждом цикле диагностики)
+COLS = tuple(chr(64 + i) for i in range(1, len(CORRECT_HEADERS) + 1))
+# (номер столбца, буква, заголовок) - готовые тройки для циклов проверки
+HEADER_CELLS = tuple(zip(range(1, len(CORRECT_HEADERS) + 1), COLS, CORRECT_HEADERS))
+
+# Путь к листу внутри xlsx-архива (отчёты WB содержат один лист)
+SHEET_PATH = "xl/worksheets/sheet1.xml"
+SHARED_STRINGS_PATH = "xl/sharedStrings.xml"
+
+_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_ROW = f"{{{_NS}}}row"
+_CELL = f"{{{_NS}}}c"
+_VALUE = f"{{{_NS}}}v"
+_FORMULA = f"{{{_NS}}}f"
+_INLINE = f"{{{_NS}}}is"
+_TEXT = f"{{{_NS}}}t"
+_SHEET_DATA = f"{{{_NS}}}sheetData"
+_DIMENSION = f"{{{_NS}}}dimension"
+_MERGE_CELLS = f"{{{_NS}}}mergeCells"
+
+_CELL_REF_RE = re.compile(r"^([A-Z]+)(\d+)$")
+_PARSER = etree.XMLParser(huge_tree=True, remove_blank_text=False)
+
+
+def _column_index(letters: str) -> int:
+    """Преобразует буквы столбца в номер (A=1, B=2, ..., AA=27)."""
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - 64
+    return index
+
+
+def _column_letter(index: int) -> str:
+    """Преобразует номер столбца в буквы (1=A, 2=B, ..., 27=AA)."""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _shift_ref(ref: str) -> str:
+    """Сдвигает ссылку на ячейку или диапазон (A2, A2:P10) на одну строку вверх."""
+    parts = []
+    for part in ref.split(":"):
+        match = _CELL_REF_RE.match(part)
+        if not match:
+            return ref
+        parts.append(f"{match.group(1)}{int(match.group(2)) - 1}")
+    return ":".join(parts)
+
+
+def _load_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    """Читает таблицу общих строк (если она есть в архиве)."""
+    if SHARED_STRINGS_PATH not in archive.namelist():
+        return []
+    root = etree.fromstring(archive.read(SHARED_STRINGS_PATH), _PARSER)
+    return ["".join(si.itertext(_TEXT)) for si in root]
+
+
+def _cell_text(cell: etree._Element, shared_strings: List[str]) -> Optional[str]:
+    """Возвращает текстовое значение ячейки <c>."""
+    cell_type = cell.get("t")
+    if cell_type == "inlineStr":
+        inline = cell.find(_INLINE)
+        return "".join(inline.itertext(_TEXT)) if inline is not None else None
+    value = cell.find(_VALUE)
+    if value is None or value.text is None:
+        return None
+    if cell_type == "s":
+        return shared_strings[int(value.text)]
+    return value.text
+
+
+def _row_values(row: Optional[etree._Element], width: int, shared_strings: List[str]) -> List[Optional[str]]:
+    """Возвращает значения первых width столбцов строки <row>."""
+    values: List[Optional[str]] = [None] * width
+    if row is None:
+        return values
+    for cell in row.iter(_CELL):
+        match = _CELL_REF_RE.match(cell.get("r", ""))
+        if not match:
+            continue
+        col_idx = _column_index(match.group(1))
+        if col_idx <= width:
+            values[col_idx - 1] = _cell_text(cell, shared_strings)
+    return values
+
+
+def _set_inline_string(cell: etree._Element, text: str) -> None:
+    """Записывает в ячейку строковое значение (inline string, без sharedStrings)."""
+    for child in list(cell):
+        if child.tag in (_VALUE, _FORMULA, _INLINE):
+            cell.remove(child)
+    cell.set("t", "inlineStr")
+    inline = etree.SubElement(cell, _INLINE)
+    etree.SubElement(inline, _TEXT).text = text
+
+
+@functools.lru_cache(maxsize=None)
+def _header_refs(width: int) -> Dict[str, int]:
+    """Ссылки ячеек первой строки ("A1", "B1", ...) → номер столбца; считаются один раз."""
+    return {f"{_column_letter(col_idx)}1": col_idx for col_idx in range(1, width + 1)}
+
+
+def _write_headers(row: etree._Element, headers: Sequence[str]) -> None:
+    """Записывает заголовки в первые len(headers) ячеек строки (стили ячеек сохраняются)."""
+    refs = _header_refs(len(headers))
+    cells: Dict[int, etree._Element] = {}
+    # Первая ячейка правее заголовков: перед ней вставляются недостающие ячейки
+    first_beyond: Optional[etree._Element] = None
+    for cell in row.findall(_CELL):
+        col_idx = refs.get(cell.get("r"))
+        if col_idx is not None:
+            cells[col_idx] = cell
+        elif first_beyond is None:
+            first_beyond = cell
+
+    for (ref, col_idx), header in zip(refs.items(), headers):
+        cell = cells.get(col_idx)
+        if cell is None:
+            cell = etree.Element(_CELL, r=ref)
+            # Вставляем ячейку перед первой ячейкой с бо́льшим номером столбца
+            following = next(
+                (cells[idx] for idx in range(col_idx + 1, len(headers) + 1) if idx in cells),
+                first_beyond,
+            )
+            if following is not None:
+                following.addprevious(cell)
+            else:
+                row.append(cell)
+            cells[col_idx] = cell
+        _set_inline_string(cell, header)
+
+
+def _patch_sheet(root: etree._Element, headers: Sequence[str]) -> None:
+    """Удаляет первую строку листа и записывает заголовки в новую первую строку.
+
+    Args:
+        root: Корневой элемент <worksheet>
+        headers: Заголовки для столбцов A, B, C, ...
+    """
+    sheet_data = root.find(_SHEET_DATA)
+    if sheet_data is None:
+        raise ValueError("В листе нет элемента sheetData")
+
+    # Шаг 1: удаляем строку 1 и сдвигаем остальные строки и ячейки вверх
+    new_first_row = None
+    # Атрибут r у строки тоже необязателен: без него строка идёт следующей за предыдущей
+    row_idx = 0
+    for row in list(sheet_data):
+        row_num = row.get("r")
+        row_idx = int(row_num) if row_num is not None else row_idx + 1
+        row_num = str(row_idx)
+        if row_idx == 1:
+            sheet_data.remove(row)
+            continue
+        new_row_num = str(row_idx - 1)
+        row.set("r", new_row_num)
+        # Номер строки в ссылках ячеек известен - меняем окончание ссылки без регулярного выражения
+        # (атрибут r у ячейки необязателен, ячейки без него не трогаем)
+        suffix_len = len(row_num)
+        for cell in row.iter(_CELL):
+            ref = cell.get("r")
+            if ref is None:
+                continue
+            if ref.endswith(row_num) and ref[:-suffix_len].isalpha():
+                cell.set("r", ref[:-suffix_len] + new_row_num)
+            else:
+                cell.set("r", _shift_ref(ref))
+        if row_idx == 2:
+            new_first_row = row
+
+    if new_first_row is None:
+        new_first_row = etree.Element(_ROW, r="1")
+        sheet_data.insert(0, new_first_row)
+
+    # Шаг 2: заголовки в новую первую строку (бывшую вторую)
+    _write_headers(new_first_row, headers)
+
+    # Шаг 3: объединения в удалённой строке теряют смысл, остальные сдвигаем
+    merge_cells = root.find(_MERGE_CELLS)
+    if merge_cells is not None:
+        for merge in list(merge_cells):
+            match = _CELL_REF_RE.match(merge.get("ref", "").split(":")[0])
+            if match and int(match.group(2)) == 1:
+                merge_cells.remove(merge)
+            else:
+                merge.set("ref", _shift_ref(merge.get("ref")))
+        if len(merge_cells):
+            merge_cells.set("count", str(len(merge_cells)))
+        else:
+            root.remove(merge_cells)
+
+    dimension = root.find(_DIMENSION)
+    if dimension is not None:
+        start, _, end = dimension.get("ref", "").partition(":")
+        if end:
+            end_match = _CELL_REF_RE.match(end)
+            if end_match and int(end_match.group(2)) > 1:
+                dimension.set("ref", f"{start}:{_shift_ref(end)}")
+
+
+def rewrite_header_row(
+    file_path: Path, headers: Sequence[str]
+) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+    """Потоково переписывает активный лист без первой строки, начиная с заголовков.
+
+    Запасной путь для файлов, лист которых лежит не в xl/worksheets/sheet1.xml.
+    Исходник читается в режиме read_only, результат пишется в режиме
+    write_only (без сетки ячеек в памяти), поэтому стили и объединения
+    не переносятся. Файл перезаписывается атомарно через временный файл.
+
+    Args:
+        file_path: Путь к xlsx-файлу
+        headers: Заголовки для столбцов A, B, C, ...
+
+    Returns:
+        Кортеж (старая первая строка, новая первая строка) — значения
+        первых len(headers) столбцов
+    """
+    # openpyxl нужен только для этого запасного пути - импортируем по месту
+    from openpyxl import Workbook, load_workbook
+
+    file_path = Path(file_path)
+    width = len(headers)
+    tmp_path = file_path.with_name(f"~{file_path.name}.tmp")
+
+    src = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        src_ws = src.active
+        dst = Workbook(write_only=True)
+        dst_ws = dst.create_sheet(src_ws.title)
+
+        rows = src_ws.iter_rows(values_only=True)
+        old_first_row = list(next(rows, ()))
+        # Бывшая вторая строка становится первой: её первые столбцы заменяются на headers
+        second_row = list(next(rows, ()))
+        dst_ws.append(list(headers) + second_row[width:])
+        for row in rows:
+            dst_ws.append(row)
+
+        try:
+            dst.save(tmp_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    finally:
+        src.close()
+
+    os.replace(tmp_path, file_path)
+    old_values = (old_first_row + [None] * width)[:width]
+    return old_values, list(headers)
+
+
+def replace_header_row(
+    file_path: Path, headers: Sequence[str]
+) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+    """Удаляет первую строку листа и заменяет новую первую строку заголовками.
+
+    Редактируется только XML листа: строки и ссылки ячеек сдвигаются на одну
+    вверх, объединения в первой строке удаляются, заголовки записываются
+    как inline-строки. Файл перезаписывается атомарно через временный файл.
+
+    Args:
+        file_path: Путь к xlsx-файлу
+        headers: Заголовки для столбцов A, B, C, ...
+
+    Returns:
+        Кортеж (старая первая строка, новая первая строка) — значения
+        первых len(headers) столбцов
+    """
+    file_path = Path(file_path)
+    width = len(headers)
+
+    with zipfile.ZipFile(file_path, "r") as zin:
+        if SHEET_PATH not in zin.namelist():
+            # Нестандартная раскладка архива - переписываем лист потоково;
+            # архив закрываем сразу: на Windows открытый файл нельзя заменить
+            zin.close()
+            return rewrite_header_row(file_path, headers)
+
+        shared_strings = _load_shared_strings(zin)
+        root = etree.fromstring(zin.read(SHEET_PATH), _PARSER)
+
+        sheet_data = root.find(_SHEET_DATA)
+        old_first_row = sheet_data.find(f"{_ROW}[@r='1']") if sheet_data is not None else None
+        old_values = _row_values(old_first_row, width, shared_strings)
+
+        _patch_sheet(root, headers)
+        # Проверяем новую первую строку по дереву в памяти, до записи файла
+        new_values = _row_values(root.find(f"{_SHEET_DATA}/{_ROW}[@r='1']"), width, shared_strings)
+        sheet_xml = etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+        tmp_path = file_path.with_name(f"~{file_path.name}.tmp")
+        try:
+            with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zout:
+                for item in zin.infolist():
+                    if item.filename == SHEET_PATH:
+                        zout.writestr(item, sheet_xml)
+                    else:
+                        zout.writestr(item, zin.read(item.filename))
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    os.replace(tmp_path, file_path)
+    return old_values, new_values
+
+
+def needs_fix(file_path: Path, headers: Sequence[str] = CORRECT_HEADERS) -> bool:
+    """Проверяет, нужно ли исправлять заголовки файла.
+
+    XML листа читается потоково до первой строки, поэтому проверка уже
+    исправленного файла не требует разбора всего листа. Повторный запуск
+    исправления по такому файлу удалил бы настоящую строку заголовков.
+
+    Args:
+        file_path: Путь к xlsx-файлу
+        headers: Ожидаемые заголовки первой строки
+
+    Returns:
+        False, если первая строка уже совпадает с headers
+    """
+    with zipfile.ZipFile(file_path, "r") as archive:
+        if SHEET_PATH not in archive.namelist():
+            return True
+        with archive.open(SHEET_PATH) as sheet:
+            first_row = next(
+                (row for _, row in etree.iterparse(sheet, tag=_ROW, huge_tree=True)), None
+            )
+        if first_row is None or first_row.get("r") != "1":
+            return True
+        # Общие строки читаем только если они встречаются в первой строке
+        uses_shared = any(cell.get("t") == "s" for cell in first_row.iter(_CELL))
+        shared_strings = _load_shared_strings(archive) if uses_shared else []
+        return _row_values(first_row, len(headers), shared_strings) != list(headers)
+
+
+def fix_file_headers(file_path: Path, verbose: bool = False) -> Tuple[str, bool, List[Tuple[str, str]]]:
+    """Исправляет заголовки в файле отчёта.
+
+    1. Разъединяет объединённые ячейки в первой строке
+    2. Удаляет первую строку (неполные заголовки)
+    3. Записывает CORRECT_HEADERS в новую первую строку и сверяет результат
+
+    Выполняется в дочернем процессе, поэтому вместо вывода собирает записи лога.
+
+    Args:
+        file_path: Путь к xlsx-файлу
+        verbose: Показывать старую и новую первую строку по всем столбцам (уровень DEBUG)
+
+    Returns:
+        Кортеж (имя файла, успех, записи лога (уровень, сообщение))
+    """
+    log = [("INFO", f"\n{'='*60}"), ("INFO", f"Обработка: {file_path.name}"), ("INFO", '='*60)]
+
+    old_first_row, new_first_row = replace_header_row(file_path, CORRECT_HEADERS)
+
+    if verbose:
+        log.append(("DEBUG", "ТЕКУЩАЯ первая строка:"))
+        for (i, col, _), value in zip(HEADER_CELLS, old_first_row):
+            log.append(("DEBUG", f"  {col} (col {i}): {value}"))
+    else:
+        log.append(("INFO", f"  Старая первая строка: {old_first_row[:5]}..."))
+    log.append(("INFO", "  ✓ Первая строка удалена, заголовки записаны"))
+
+    # Проверяем результат (по дереву XML в памяти, без повторного открытия файла)
+    if verbose:
+        log.append(("DEBUG", "НОВАЯ первая строка:"))
+    success = True
+    for (i, col, expected), value in zip(HEADER_CELLS, new_first_row):
+        if verbose:
+            match = "✓" if value == expected else "✗"
+            log.append(("DEBUG", f"  {col} (col {i}): {value} {match}"))
+        if value != expected:
+            log.append(("WARNING", f"  ✗ {col}: ожидалось '{expected}', получено '{value}'"))
+            success = False
+
+    if success:
+        log.append(("INFO", "✅ Файл успешно обработан!"))
+    else:
+        log.append(("WARNING", "⚠️ Обнаружены расхождения!"))
+
+    return file_path.name, success, log
+
+
+def process_dir(data_dir: Path, verbose: bool = False) -> Dict[str, bool]:
+    """Исправляет заголовки во всех xlsx-файлах папки и выводит итоговый отчёт.
+
+    Обработчики логов не настраивает - это делает вызывающий код (скрипты
+    fix_headers*.py или setup_logger в приложении).
+
+    Args:
+        data_dir: Папка с отчётами
+        verbose: Подробный вывод по каждому столбцу (сообщения уровня DEBUG)
+
+    Returns:
+        Словарь {имя файла: успех}
+    """
+    if not data_dir.exists():
+        logger.error(f"Папка {data_dir} не найдена!")
+        return {}
+
+    # Получаем все xlsx файлы (исключая временные ~$) за один проход по папке
+    xlsx_files = [
+        f for f in data_dir.iterdir()
+        if f.suffix == ".xlsx" and not f.name.startswith("~$") and f.is_file()
+    ]
+
+    if not xlsx_files:
+        logger.warning(f"Файлы .xlsx не найдены в {data_dir}")
+        return {}
+
+    logger.info(f"\n{'='*60}")
+    logger.info(f"Найдено файлов: {len(xlsx_files)}")
+    logger.info('='*60)
+
+    # Уже исправленные файлы пропускаем: повторная обработка удалила бы заголовки
+    results: Dict[str, bool] = {}
+    pending: List[Path] = []
+    for file_path in xlsx_files:
+        try:
+            fix_needed = needs_fix(file_path)
+        except Exception as e:
+            # Повреждённый файл не должен останавливать обработку остальных
+            logger.error(f"\n✗ Ошибка ({file_path.name}): {e}")
+            results[file_path.name] = False
+            continue
+        if fix_needed:
+            pending.append(file_path)
+        else:
+            logger.info(f"✓ Заголовки уже исправлены: {file_path.name}")
+            results[file_path.name] = True
+
+    # Файлы независимы - обрабатываем параллельно, вывод печатаем по порядку
+    if pending:
+        max_workers = min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(fix_file_headers, file_path, verbose) for file_path in pending]
+            for file_path, future in zip(pending, futures):
+                try:
+                    _, success, log = future.result()
+                    for level, message in log:
+                        logger.log(level, message)
+                    results[file_path.name] = success
+                except Exception as e:
+                    logger.exception(f"\n✗ Ошибка ({file_path.name}): {e}")
+                    results[file_path.name] = False
+
+    # Итоговый отчёт
+    logger.info(f"\n{'='*60}")
+    logger.info("ИТОГОВЫЙ ОТЧЁТ")
+    logger.info('='*60)
+    for filename, success in results.items():
+        status = "✅ OK" if success else "❌ ОШИБКА"
+        logger.info(f"{status}: {filename}")
+
+    success_count = sum(1 for s in results.values() if s)
+    logger.info(f"\n{'='*60}")
+    logger.info(f"✅ Успешно обработано: {success_count}/{len(results)}")
+    logger.info('='*60)
+
+    return results
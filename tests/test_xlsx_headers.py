@@ -0,0 +1,82 @@
+"""Проверка replace_header_row: правка XML листа против openpyxl delete_rows."""
+import re
+import zipfile
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+from src.utils.xlsx_headers import CORRECT_HEADERS, SHEET_PATH, needs_fix, replace_header_row
+
+ROWS = [
+    ["Бренд", None, "Сезон", "Коллекция", "Наименование"],
+    ["brand-1", "subject-1", "season-1", "collection-1", 101],
+    ["brand-2", "subject-2", "season-2", "collection-2", 102],
+    ["brand-3", "subject-3", "season-3", "collection-3", 103],
+]
+
+
+def _build_report(path: Path) -> None:
+    """Создаёт отчёт с объединениями и строкой без атрибута r.
+
+    Строки записываются openpyxl как общие строки (sharedStrings.xml).
+    """
+    wb = Workbook()
+    ws = wb.active
+    for row in ROWS:
+        ws.append(row)
+    ws.merge_cells("A1:B1")  # объединение в первой строке
+    ws.merge_cells("C1:C2")  # объединение на несколько строк, начиная с первой
+    ws.merge_cells("D3:E4")  # объединение ниже первой строки
+    wb.save(path)
+
+    # Атрибут r необязателен: убираем его у третьей строки и её ячеек
+    with zipfile.ZipFile(path) as archive:
+        items = {item.filename: archive.read(item.filename) for item in archive.infolist()}
+    sheet_xml = items[SHEET_PATH].decode()
+    row3 = re.search(r'<row r="3"[^>]*>.*?</row>', sheet_xml).group(0)
+    row3_without_r = re.sub(r' r="[A-Z]*3"', "", row3)
+    assert row3_without_r.startswith("<row>")
+    items[SHEET_PATH] = sheet_xml.replace(row3, row3_without_r).encode()
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in items.items():
+            archive.writestr(name, data)
+
+
+def _expected_values(path: Path) -> list:
+    """Значения листа после прежнего способа: delete_rows(1) и запись заголовков.
+
+    delete_rows не сдвигает объединения, поэтому для сравнения значений они снимаются заранее.
+    """
+    wb = load_workbook(path)
+    ws = wb.active
+    for merged in list(ws.merged_cells.ranges):
+        ws.unmerge_cells(str(merged))
+    ws.delete_rows(1)
+    for col_idx, header in enumerate(CORRECT_HEADERS, start=1):
+        ws.cell(row=1, column=col_idx, value=header)
+    return [list(row) for row in ws.iter_rows(values_only=True)]
+
+
+def test_replace_header_row_matches_delete_rows(tmp_path):
+    path = tmp_path / "report.xlsx"
+    _build_report(path)
+    expected = _expected_values(path)
+    assert needs_fix(path)
+
+    old_first_row, new_first_row = replace_header_row(path, CORRECT_HEADERS)
+
+    assert old_first_row[:5] == ROWS[0]
+    assert new_first_row == CORRECT_HEADERS
+    assert not needs_fix(path)
+
+    wb = load_workbook(path)
+    ws = wb.active
+    assert [list(row) for row in ws.iter_rows(values_only=True)] == expected
+    # Объединения из первой строки удалены, остальные сдвинуты на строку вверх
+    assert {str(merged) for merged in ws.merged_cells.ranges} == {"D2:E3"}
+
+    with zipfile.ZipFile(path) as archive:
+        sheet_xml = archive.read(SHEET_PATH).decode()
+    assert '<dimension ref="A1:E3"/>' in sheet_xml
+    # Строка без r получила явный номер после сдвига
+    assert re.findall(r'<row r="(\d+)"', sheet_xml) == ["1", "2", "3"]